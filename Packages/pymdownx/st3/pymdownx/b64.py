@@ -27,9 +27,11 @@ from __future__ import unicode_literals
 from markdown import Extension
 from markdown.postprocessors import Postprocessor
 from . import util
+from . import tagrewriter
 import os
 import base64
 import re
+import threading
 # import traceback
 
 RE_SLASH_WIN_DRIVE = re.compile(r"^/[A-Za-z]{1}:/.*")
@@ -40,10 +42,13 @@ file_types = {
     (".gif",): "image/gif"
 }
 
+# Read files in multiples of 3 bytes so the encoded chunks join without padding.
+CHUNK_SIZE = 3 * 64 * 1024
+
 RE_TAG_HTML = re.compile(
     r'''(?xus)
     (?:
-        (?P<comments>(\r?\n?\s*)<!--[\s\S]*?-->(\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
+        (?P<comments>(\r?\n?\s*)<!--(?:[^-]|-(?!->))*-->(\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
         (?P<open><(?P<tag>img))
         (?P<attr>(?:\s+[\w\-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'))?)*)
         (?P<close>\s*(?:\/?)>)
@@ -63,7 +68,71 @@ RE_TAG_LINK_ATTR = re.compile(
 )
 
 
-def repl_path(m, base_path):
+def encode_file(file_name):
+    """Base64 encode a file, reading it in chunks."""
+
+    chunks = []
+    with open(file_name, "rb") as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            chunks.append(base64.b64encode(data).decode('ascii'))
+    return ''.join(chunks)
+
+
+class EncodingCache(object):
+    """
+    LRU cache of base64 encoded files.
+
+    Entries are kept by the normalized path of the file along with its modification time and size, so a changed
+    file is encoded again and replaces the older version.  The cache is bounded by the total length of the encoded
+    data, and is safe to share between conversions on different threads.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """Initialize."""
+
+        self.entries = util.LRUCache(max_bytes=max_bytes)
+        self.bytes_saved = 0
+        self.lock = threading.Lock()
+
+    def get(self, file_name, max_file_size=0):
+        """Return the base64 encoded file, or `None` if it is larger than `max_file_size`."""
+
+        stat = os.stat(file_name)
+        if max_file_size and stat.st_size > max_file_size:
+            return None
+        path = os.path.normcase(os.path.abspath(file_name))
+        state = (stat.st_mtime, stat.st_size)
+        entry = self.entries.get(path, check=lambda entry: entry[0] == state)
+        if entry is not None:
+            with self.lock:
+                self.bytes_saved += stat.st_size
+            return entry[1]
+
+        data = encode_file(file_name)
+        self.entries.store(path, (state, data), len(data))
+        return data
+
+    def clear(self):
+        """Drop all entries.  Counters are kept."""
+
+        self.entries.clear()
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+
+        stats = self.entries.stats()
+        stats['bytes_saved'] = self.bytes_saved
+        return stats
+
+
+# Shared by all Markdown instances, so repeated conversions of a document reuse the encoded images.
+cache = EncodingCache()
+
+
+def repl_path(m, base_path, max_file_size=0):
     """Replace path with b64 encoded data."""
 
     link = m.group(0)
@@ -86,11 +155,9 @@ def repl_path(m, base_path):
             ext = os.path.splitext(file_name)[1].lower()
             for b64_ext in file_types:
                 if ext in b64_ext:
-                    with open(file_name, "rb") as f:
-                        link = " src=\"data:%s;base64,%s\"" % (
-                            file_types[b64_ext],
-                            base64.b64encode(f.read()).decode('ascii')
-                        )
+                    data = cache.get(file_name, max_file_size)
+                    if data is not None:
+                        link = " src=\"data:%s;base64,%s\"" % (file_types[b64_ext], data)
                     break
 
     except Exception:  # pragma: no cover
@@ -100,26 +167,39 @@ def repl_path(m, base_path):
     return link
 
 
-def repl(m, base_path):
+def repl(m, base_path, max_file_size=0):
     """Replace."""
 
     if m.group('comments'):
         tag = m.group('comments')
     else:
         tag = m.group('open')
-        tag += RE_TAG_LINK_ATTR.sub(lambda m2: repl_path(m2, base_path), m.group('attr'))
+        tag += RE_TAG_LINK_ATTR.sub(lambda m2: repl_path(m2, base_path, max_file_size), m.group('attr'))
         tag += m.group('close')
     return tag
 
 
-class B64Postprocessor(Postprocessor):
+class B64Postprocessor(Postprocessor, tagrewriter.TagHandler):
     """Post processor for B64."""
 
+    def tag_names(self):
+        """Rewrite image tags."""
+
+        return 'img'
+
+    def rewrite_attrs(self, attrs):
+        """Replace paths in the attributes of a tag."""
+
+        basepath = self.config['base_path']
+        max_file_size = self.config['max_file_size']
+        return RE_TAG_LINK_ATTR.sub(lambda m: repl_path(m, basepath, max_file_size), attrs)
+
     def run(self, text):
         """Find and replace paths with base64 encoded file."""
 
         basepath = self.config['base_path']
-        text = RE_TAG_HTML.sub(lambda m: repl(m, basepath), text)
+        max_file_size = self.config['max_file_size']
+        text = RE_TAG_HTML.sub(lambda m: repl(m, basepath, max_file_size), text)
         return text
 
 
@@ -130,7 +210,12 @@ class B64Extension(Extension):
         """Initialize."""
 
         self.config = {
-            'base_path': [".", "Base path for b64 to use to resolve paths - Default: \".\""]
+            'base_path': [".", "Base path for b64 to use to resolve paths - Default: \".\""],
+            'max_file_size': [
+                0,
+                "Maximum size in bytes of files to embed; larger files are left linked. "
+                "0 embeds files of any size - Default: 0"
+            ]
         }
 
         super(B64Extension, self).__init__(*args, **kwargs)
@@ -140,7 +225,7 @@ class B64Extension(Extension):
 
         b64 = B64Postprocessor(md)
         b64.config = self.getConfigs()
-        md.postprocessors.add("b64", b64, "_end")
+        tagrewriter.add_handler(md, b64)
         md.registerExtension(self)
 
 
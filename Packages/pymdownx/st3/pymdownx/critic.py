@@ -33,9 +33,10 @@ import re
 STX = '\u0002'
 ETX = '\u0003'
 CRITIC_KEY = "czjqqkd:%s"
+CRITIC_KEY_PREFIX = CRITIC_KEY % ''
 CRITIC_PLACEHOLDER = CRITIC_KEY % r'[0-9]+'
-SINGLE_CRITIC_PLACEHOLDER = r'%(stx)s(?P<key>%(key)s)%(etx)s' % {
-    "key": CRITIC_PLACEHOLDER, "stx": STX, "etx": ETX
+SINGLE_CRITIC_PLACEHOLDER = r'%(stx)s%(key)s%(etx)s' % {
+    "key": CRITIC_KEY % r'(?P<key>[0-9]+)', "stx": STX, "etx": ETX
 }
 CRITIC_PLACEHOLDERS = r'''(?x)
 (?:
@@ -78,35 +79,37 @@ ALL_CRITICS = r'''(?x)
 
 RE_CRITIC = re.compile(ALL_CRITICS, re.DOTALL)
 RE_CRITIC_PLACEHOLDER = re.compile(CRITIC_PLACEHOLDERS)
-RE_CRITIC_SUB_PLACEHOLDER = re.compile(SINGLE_CRITIC_PLACEHOLDER)
 RE_CRITIC_BLOCK = re.compile(r'((?:ins|del|mark)\s+)(class=([\'"]))(.*?)(\3)')
 RE_BLOCK_SEP = re.compile(r'^\n{2,}$')
 
 
 class CriticStash(object):
-    """Stash critic marks until ready."""
+    """Stash critic marks until ready; the number in a placeholder is the index of its item."""
 
     def __init__(self, stash_key):
         """Initialize."""
 
         self.stash_key = stash_key
-        self.stash = {}
-        self.count = 0
+        self.stash = []
 
     def __len__(self):  # pragma: no cover
         """Get length of stash."""
         return len(self.stash)
 
-    def get(self, key, default=None):
-        """Get the specified item from the stash."""
+    def get(self, index, default=None):
+        """Get the item at the specified index from the stash."""
 
-        code = self.stash.get(key, default)
-        return code
+        try:
+            code = self.stash[index]
+        except IndexError:
+            code = None
+        return default if code is None else code
 
-    def remove(self, key):  # pragma: no cover
-        """Remove the specified item from the stash."""
+    def remove(self, index):  # pragma: no cover
+        """Remove the item at the specified index from the stash."""
 
-        del self.stash[key]
+        # Keep the indexes of the other items.
+        self.stash[index] = None
 
     def store(self, code):
         """
@@ -114,16 +117,13 @@ class CriticStash(object):
 
         Return placeholder.
         """
-        key = self.stash_key % str(self.count)
-        self.stash[key] = code
-        self.count += 1
-        return STX + key + ETX
+        self.stash.append(code)
+        return STX + self.stash_key % (len(self.stash) - 1) + ETX
 
     def clear(self):
         """Clear the stash."""
 
-        self.stash = {}
-        self.count = 0
+        self.stash = []
 
 
 class CriticsPostprocessor(Postprocessor):
@@ -135,14 +135,6 @@ class CriticsPostprocessor(Postprocessor):
         super(CriticsPostprocessor, self).__init__()
         self.critic_stash = critic_stash
 
-    def subrestore(self, m):
-        """Replace all critic tags in the paragraph block `<p>(critic del close)(critic ins close)</p>` etc."""
-        content = None
-        key = m.group('key')
-        if key is not None:
-            content = self.critic_stash.get(key)
-        return content
-
     def block_edit(self, m):
         """Handle block edits."""
 
@@ -154,18 +146,19 @@ class CriticsPostprocessor(Postprocessor):
     def restore(self, m):
         """Replace placeholders with actual critic tags."""
 
-        content = None
-        if m.group('block_keys') is not None:
-            content = RE_CRITIC_SUB_PLACEHOLDER.sub(
-                self.subrestore, m.group('block_keys')
-            )
-            if content is not None:
-                content = RE_CRITIC_BLOCK.sub(self.block_edit, content)
-        else:
-            text = self.critic_stash.get(m.group('key'))
-            if text is not None:
-                content = text
-        return content if content is not None else m.group(0)
+        block_keys = m.group('block_keys')
+        if block_keys is None:
+            return self.critic_stash.get(int(m.group('key')), m.group(0))
+
+        # Replace all critic tags in the paragraph block `<p>(critic del close)(critic ins close)</p>` etc.
+        start = len(CRITIC_KEY_PREFIX)
+        content = ''.join(
+            [
+                self.critic_stash.get(int(key[start:]), '')
+                for key in block_keys[len(STX):-len(ETX)].split(ETX + STX)
+            ]
+        )
+        return RE_CRITIC_BLOCK.sub(self.block_edit, content)
 
     def run(self, text):
         """Replace critic placeholders."""
@@ -184,41 +177,34 @@ class CriticViewPreprocessor(Preprocessor):
         super(CriticViewPreprocessor, self).__init__()
         self.critic_stash = critic_stash
 
-    def _ins(self, text):
+    def _ins(self, text, parts):
         """Handle critic inserts."""
 
+        store = self.critic_stash.store
         if RE_BLOCK_SEP.match(text):
-            return '\n\n%s\n\n' % self.critic_stash.store('<ins class="critic break">&nbsp;</ins>')
-        return (
-            self.critic_stash.store('<ins class="critic">') +
-            text +
-            self.critic_stash.store('</ins>')
-        )
+            parts.append('\n\n%s\n\n' % store('<ins class="critic break">&nbsp;</ins>'))
+        else:
+            parts.extend((store('<ins class="critic">'), text, store('</ins>')))
 
-    def _del(self, text):
+    def _del(self, text, parts):
         """Handle critic deletes."""
 
+        store = self.critic_stash.store
         if RE_BLOCK_SEP.match(text):
-            return self.critic_stash.store('<del class="critic break">&nbsp;</del>')
-        return (
-            self.critic_stash.store('<del class="critic">') +
-            text +
-            self.critic_stash.store('</del>')
-        )
+            parts.append(store('<del class="critic break">&nbsp;</del>'))
+        else:
+            parts.extend((store('<del class="critic">'), text, store('</del>')))
 
-    def _mark(self, text):
+    def _mark(self, text, parts):
         """Handle critic marks."""
 
-        return (
-            self.critic_stash.store('<mark class="critic">') +
-            text +
-            self.critic_stash.store('</mark>')
-        )
+        store = self.critic_stash.store
+        parts.extend((store('<mark class="critic">'), text, store('</mark>')))
 
-    def _comment(self, text):
+    def _comment(self, text, parts):
         """Handle critic comments."""
 
-        return (
+        parts.append(
             self.critic_stash.store(
                 '<span class="critic comment">' +
                 self.html_escape(text, strip_nl=True) +
@@ -226,22 +212,20 @@ class CriticViewPreprocessor(Preprocessor):
             )
         )
 
-    def critic_view(self, m):
-        """Insert appropriate HTML to tags to visualize Critic marks."""
+    def critic_view(self, m, parts):
+        """Add the text and placeholders that visualize the Critic mark to `parts`."""
 
         if m.group('ins_open'):
-            return self._ins(m.group('ins_text'))
+            self._ins(m.group('ins_text'), parts)
         elif m.group('del_open'):
-            return self._del(m.group('del_text'))
+            self._del(m.group('del_text'), parts)
         elif m.group('sub_open'):
-            return (
-                self._del(m.group('sub_del_text')) +
-                self._ins(m.group('sub_ins_text'))
-            )
+            self._del(m.group('sub_del_text'), parts)
+            self._ins(m.group('sub_ins_text'), parts)
         elif m.group('mark_open'):
-            return self._mark(m.group('mark_text'))
+            self._mark(m.group('mark_text'), parts)
         elif m.group('com_open'):
-            return self._comment(m.group('com_text'))
+            self._comment(m.group('com_text'), parts)
 
     def critic_parse(self, m):
         """
@@ -275,16 +259,22 @@ class CriticViewPreprocessor(Preprocessor):
     def run(self, lines):
         """Process critic marks."""
 
-        # Determine processor type to use
-        if self.config['mode'] == "view":
-            processor = self.critic_view
-        else:
-            processor = self.critic_parse
-
-        # Find and process critic marks
-        text = RE_CRITIC.sub(processor, '\n'.join(lines))
-
-        return text.split('\n')
+        view = self.config['mode'] == "view"
+        text = '\n'.join(lines)
+
+        # Find and process critic marks, collecting the text between them and what replaces them in one pass
+        parts = []
+        index = 0
+        for m in RE_CRITIC.finditer(text):
+            parts.append(text[index:m.start()])
+            if view:
+                self.critic_view(m, parts)
+            else:
+                parts.append(self.critic_parse(m))
+            index = m.end()
+        parts.append(text[index:])
+
+        return ''.join(parts).split('\n')
 
 
 class CriticExtension(Extension):
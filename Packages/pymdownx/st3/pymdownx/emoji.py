@@ -27,6 +27,8 @@ from markdown import Extension
 from markdown.inlinepatterns import Pattern
 from markdown import util as md_util
 from . import util
+from . import emoji_index
+import copy
 
 RE_EMOJI = r'(:[+\-\w]+:)'
 SUPPORTED_INDEXES = ('emojione', 'gemoji', 'twemoji')
@@ -44,6 +46,7 @@ VALID_TITLE = (LONG_TITLE, SHORT_TITLE, NO_TITLE)
 UNICODE_ENTITY = 'html_entity'
 UNICODE_ALT = ('unicode', UNICODE_ENTITY)
 LEGACY_ARG_COUNT = 8
+MAX_CACHED = 512
 
 
 def add_attriubtes(options, attributes):
@@ -58,22 +61,19 @@ def add_attriubtes(options, attributes):
 def emojione():
     """The EmojiOne index."""
 
-    from . import emoji1_db as emoji_map
-    return {"name": emoji_map.name, "emoji": emoji_map.emoji, "aliases": emoji_map.aliases}
+    return emoji_index.load_index('emoji1_db')
 
 
 def gemoji():
     """The Gemoji index."""
 
-    from . import gemoji_db as emoji_map
-    return {"name": emoji_map.name, "emoji": emoji_map.emoji, "aliases": emoji_map.aliases}
+    return emoji_index.load_index('gemoji_db')
 
 
 def twemoji():
     """The Twemoji index."""
 
-    from . import twemoji_db as emoji_map
-    return {"name": emoji_map.name, "emoji": emoji_map.emoji, "aliases": emoji_map.aliases}
+    return emoji_index.load_index('twemoji_db')
 
 
 ###################
@@ -221,6 +221,8 @@ class EmojiPattern(Pattern):
         title = config['title']
         alt = config['alt']
 
+        self._cache = {}
+        self._cache_state = None
         self._set_index(config["emoji_index"])
         self.markdown = md
         self.unicode_alt = alt in UNICODE_ALT
@@ -235,6 +237,17 @@ class EmojiPattern(Pattern):
         """Set the index."""
 
         self.emoji_index = index()
+        self._cache_state = None
+
+    def _check_cache(self):
+        """Clear the cache if the options changed since it was filled."""
+
+        state = (
+            self.generator, self.title, self.unicode_alt, self.encoded_alt, self.remove_var_sel, self.options
+        )
+        if state != self._cache_state:
+            self._cache.clear()
+            self._cache_state = copy.deepcopy(state)
 
     def _remove_variation_selector(self, value):
         """Remove variation selectors."""
@@ -307,25 +320,36 @@ class EmojiPattern(Pattern):
 
         el = m.group(2)
 
-        shortname = self.emoji_index['aliases'].get(el, el)
-        alias = None if shortname == el else el
-        emoji = self.emoji_index['emoji'].get(shortname, None)
-        if emoji:
-            uc, uc_alt = self._get_unicode(emoji)
-            title = self._get_title(el, emoji)
-            alt = self._get_alt(el, uc_alt)
-            category = self._get_category(emoji)
-            el = self.generator(
-                self.emoji_index['name'],
-                shortname,
-                alias,
-                uc,
-                alt,
-                title,
-                category,
-                self.options,
-                self.markdown
-            )
+        # The matched text determines both the shortname and the alias, so the generator arguments and, for
+        # elements, the generated element are cached per matched text.
+        self._check_cache()
+        entry = self._cache.get(el)
+        if entry is None:
+            shortname = self.emoji_index['aliases'].get(el, el)
+            alias = None if shortname == el else el
+            emoji = self.emoji_index['emoji'].get(shortname, None)
+            if emoji:
+                uc, uc_alt = self._get_unicode(emoji)
+                title = self._get_title(el, emoji)
+                alt = self._get_alt(el, uc_alt)
+                category = self._get_category(emoji)
+                args = (self.emoji_index['name'], shortname, alias, uc, alt, title, category)
+            else:
+                args = None
+            if len(self._cache) >= MAX_CACHED:
+                self._cache.clear()
+            entry = self._cache[el] = [args, None]
+
+        args, template = entry
+        if args is None:
+            return el
+        if template is not None:
+            return copy.deepcopy(template)
+
+        el = self.generator(*(args + (self.options, self.markdown)))
+        # Only elements are reused: strings may be placeholders of a document's html stash.
+        if md_util.etree.iselement(el):
+            entry[1] = copy.deepcopy(el)
 
         return el
 
@@ -0,0 +1,316 @@
+"""
+Compact emoji index.
+
+pymdownx.emoji_index
+Packed form of the autogen emoji databases.
+
+The `*_db.py` modules hold each index as one large dictionary literal which is slow to import and costs a
+dictionary per emoji in every process.  This module packs an index into a single bytes blob (`*_db.idx`, stored
+next to the database module) and exposes it through read-only mappings that `pymdownx.emoji` can use in place
+of the dictionaries.
+
+Blob layout (all integers little endian):
+
+    header   magic, record count, alias count, record offset, alias offset, string offset, name, version
+    records  shortname, category, name, unicode, unicode_alt  (sorted by shortname)
+    aliases  alias, record index  (sorted by alias)
+    strings  UTF-8 encoded strings referenced as (offset, length) pairs
+
+Missing fields are stored with the offset `NO_STRING`.
+
+Regenerate the blobs after updating the autogen databases:
+
+    python -m pymdownx.emoji_index
+
+MIT license.
+
+Copyright (c) 2017 Isaac Muse <isaacmuse@gmail.com>
+"""
+from __future__ import unicode_literals
+import importlib
+import os
+import pkgutil
+import struct
+import sys
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+MAGIC = b'PMDXEMJ1'
+HEADER = struct.Struct('<8sIIIIIIHIH')
+STRING = struct.Struct('<IH')
+RECORD = struct.Struct('<' + 'IH' * 5)
+ALIAS = struct.Struct('<IHI')
+NO_STRING = 0xFFFFFFFF
+FIELDS = ('category', 'name', 'unicode', 'unicode_alt')
+DATABASES = ('emoji1_db', 'twemoji_db', 'gemoji_db')
+
+
+def _read_string(blob, base, offset, length):
+    """Read a string from the string table."""
+
+    return blob[base + offset:base + offset + length].decode('utf-8')
+
+
+class EmojiRecords(Mapping):
+    """Read-only mapping of shortnames to emoji dictionaries."""
+
+    def __init__(self, index):
+        """Initialize."""
+
+        self._index = index
+
+    def __getitem__(self, shortname):
+        """Get the emoji dictionary of a shortname."""
+
+        index = self._index
+        position = index.find_record(shortname)
+        if position is None:
+            raise KeyError(shortname)
+        return index.read_record(position)
+
+    def get(self, shortname, default=None):
+        """Get the emoji dictionary of a shortname, or `default`."""
+
+        index = self._index
+        position = index.find_record(shortname)
+        return default if position is None else index.read_record(position)
+
+    def __contains__(self, shortname):
+        """Check if a shortname is in the index."""
+
+        return self._index.find_record(shortname) is not None
+
+    def __iter__(self):
+        """Iterate the shortnames in sorted order."""
+
+        index = self._index
+        for position in range(index.record_count):
+            yield index.read_key(index.record_offset + position * RECORD.size)
+
+    def __len__(self):
+        """Get the number of emoji."""
+
+        return self._index.record_count
+
+
+class EmojiAliases(Mapping):
+    """Read-only mapping of aliases to shortnames."""
+
+    def __init__(self, index):
+        """Initialize."""
+
+        self._index = index
+
+    def __getitem__(self, alias):
+        """Get the shortname of an alias."""
+
+        index = self._index
+        position = index.find_alias(alias)
+        if position is None:
+            raise KeyError(alias)
+        return index.read_alias(position)
+
+    def get(self, alias, default=None):
+        """Get the shortname of an alias, or `default`."""
+
+        index = self._index
+        position = index.find_alias(alias)
+        return default if position is None else index.read_alias(position)
+
+    def __contains__(self, alias):
+        """Check if an alias is in the index."""
+
+        return self._index.find_alias(alias) is not None
+
+    def __iter__(self):
+        """Iterate the aliases in sorted order."""
+
+        index = self._index
+        for position in range(index.alias_count):
+            yield index.read_key(index.alias_offset + position * ALIAS.size)
+
+    def __len__(self):
+        """Get the number of aliases."""
+
+        return self._index.alias_count
+
+
+class CompactIndex(object):
+    """An emoji index backed by a packed bytes blob."""
+
+    def __init__(self, blob):
+        """Initialize."""
+
+        (
+            magic, self.record_count, self.alias_count, self.record_offset, self.alias_offset,
+            self.string_offset, name_offset, name_length, version_offset, version_length
+        ) = HEADER.unpack_from(blob, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a compact emoji index')
+        self.blob = blob
+        self.name = _read_string(blob, self.string_offset, name_offset, name_length)
+        self.version = _read_string(blob, self.string_offset, version_offset, version_length)
+        self.emoji = EmojiRecords(self)
+        self.aliases = EmojiAliases(self)
+
+    def read_key(self, position):
+        """Read the string that leads the table entry at `position`."""
+
+        offset, length = STRING.unpack_from(self.blob, position)
+        return _read_string(self.blob, self.string_offset, offset, length)
+
+    def read_alias(self, position):
+        """Read the shortname of the alias entry at `position`."""
+
+        record = struct.unpack_from('<I', self.blob, position + STRING.size)[0]
+        return self.read_key(self.record_offset + record * RECORD.size)
+
+    def read_record(self, position):
+        """Read the emoji dictionary of the record at `position`."""
+
+        values = RECORD.unpack_from(self.blob, position)
+        emoji = {}
+        for i, field in enumerate(FIELDS, 1):
+            offset = values[i * 2]
+            if offset != NO_STRING:
+                emoji[field] = _read_string(self.blob, self.string_offset, offset, values[i * 2 + 1])
+        return emoji
+
+    def _search(self, key, start, count, size):
+        """Binary search a sorted table for `key` and return the position of its entry."""
+
+        try:
+            key = key.encode('utf-8')
+        except AttributeError:
+            return None
+        blob = self.blob
+        base = self.string_offset
+        lo = 0
+        hi = count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            position = start + mid * size
+            offset, length = STRING.unpack_from(blob, position)
+            value = blob[base + offset:base + offset + length]
+            if value < key:
+                lo = mid + 1
+            elif value > key:
+                hi = mid
+            else:
+                return position
+        return None
+
+    def find_record(self, shortname):
+        """Get the position of the record of `shortname`, or `None`."""
+
+        return self._search(shortname, self.record_offset, self.record_count, RECORD.size)
+
+    def find_alias(self, alias):
+        """Get the position of the entry of `alias`, or `None`."""
+
+        return self._search(alias, self.alias_offset, self.alias_count, ALIAS.size)
+
+    def as_index(self):
+        """Return the index in the form expected by `pymdownx.emoji`."""
+
+        return {"name": self.name, "emoji": self.emoji, "aliases": self.aliases}
+
+
+def build_index(name, version, emoji, aliases):
+    """Pack an emoji database into a bytes blob."""
+
+    strings = []
+    refs = {}
+    size = [0]
+
+    def ref(value):
+        """Add a string to the string table and return its offset and length."""
+
+        if value is None:
+            return NO_STRING, 0
+        if value not in refs:
+            data = value.encode('utf-8')
+            refs[value] = (size[0], len(data))
+            strings.append(data)
+            size[0] += len(data)
+        return refs[value]
+
+    def sort_key(value):
+        """Sort as the lookups compare: by UTF-8 bytes."""
+
+        return value.encode('utf-8')
+
+    shortnames = sorted(emoji, key=sort_key)
+    positions = dict((shortname, i) for i, shortname in enumerate(shortnames))
+    records = []
+    for shortname in shortnames:
+        values = list(ref(shortname))
+        for field in FIELDS:
+            values.extend(ref(emoji[shortname].get(field)))
+        records.append(RECORD.pack(*values))
+    alias_entries = []
+    for alias in sorted(aliases, key=sort_key):
+        alias_entries.append(ALIAS.pack(*(ref(alias) + (positions[aliases[alias]],))))
+    name_ref = ref(name)
+    version_ref = ref(version)
+
+    record_offset = HEADER.size
+    alias_offset = record_offset + len(records) * RECORD.size
+    string_offset = alias_offset + len(alias_entries) * ALIAS.size
+    header = HEADER.pack(
+        MAGIC, len(records), len(alias_entries), record_offset, alias_offset, string_offset,
+        name_ref[0], name_ref[1], version_ref[0], version_ref[1]
+    )
+    return b''.join([header] + records + alias_entries + strings)
+
+
+def index_path(database):
+    """Get the path of the blob of an autogen database module."""
+
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), database + '.idx')
+
+
+def write_index(database):
+    """Generate the blob of an autogen database module, like `emoji1_db`."""
+
+    module = importlib.import_module('.' + database, __package__)
+    blob = build_index(module.name, module.version, module.emoji, module.aliases)
+    with open(index_path(database), 'wb') as f:
+        f.write(blob)
+    return blob
+
+
+_loaded = {}
+
+
+def load_index(database):
+    """
+    Load the index of an autogen database module.
+
+    The blob is read once per process.  If it is missing or unreadable, the dictionary module is used instead.
+    """
+
+    index = _loaded.get(database)
+    if index is None:
+        try:
+            blob = pkgutil.get_data(__package__, database + '.idx')
+            index = CompactIndex(blob).as_index()
+        except Exception:
+            module = importlib.import_module('.' + database, __package__)
+            index = {"name": module.name, "emoji": module.emoji, "aliases": module.aliases}
+        _loaded[database] = index
+    return index
+
+
+def main():
+    """Regenerate the blobs."""
+
+    for database in DATABASES:
+        blob = write_index(database)
+        sys.stdout.write('%s: %d bytes\n' % (index_path(database), len(blob)))
+
+
+if __name__ == '__main__':
+    main()
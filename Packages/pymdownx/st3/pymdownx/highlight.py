@@ -26,7 +26,9 @@ from __future__ import unicode_literals
 from markdown import Extension
 from markdown.treeprocessors import Treeprocessor
 from markdown import util as md_util
+from . import util
 import copy
+import hashlib
 from collections import OrderedDict
 try:
     from pygments import highlight
@@ -78,6 +80,77 @@ DEFAULT_CONFIG = {
     ]
 }
 
+# Pygments lexers and formatters by their settings, shared by all `Highlight` objects.
+# Lexers are looked up by name and options; unknown names are stored as `None`.
+lexer_pool = {}
+formatter_pool = {}
+
+
+def get_pooled_lexer(language, options):
+    """Get a shared lexer by name, or `None` if there is no such lexer."""
+
+    key = (language, tuple(sorted(options.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = None
+    if key is not None and key in lexer_pool:
+        return lexer_pool[key]
+
+    try:
+        lexer = get_lexer_by_name(language, **options)
+    except Exception:
+        lexer = None
+    if key is not None:
+        lexer_pool[key] = lexer
+    return lexer
+
+
+def get_pooled_formatter(
+    formatter_class, css_class, style, noclasses, linenos, linestart, linestep, linespecial, hl_lines
+):
+    """
+    Get a formatter for one block.
+
+    Creating a formatter builds its style sheet, so one is kept per class, style and CSS class.  Each block gets a
+    shallow copy of it with its own line settings, as the formatters only read those while formatting.
+    """
+
+    key = (formatter_class, css_class, style, noclasses)
+    try:
+        formatter = formatter_pool.get(key)
+    except TypeError:
+        key = None
+        formatter = None
+    if formatter is None:
+        formatter = formatter_class(cssclass=css_class, style=style, noclasses=noclasses)
+        if key is not None:
+            formatter_pool[key] = formatter
+
+    # Apply the line settings as `HtmlFormatter` does.
+    formatter = copy.copy(formatter)
+    if linenos == 'inline':
+        formatter.linenos = 2
+    elif linenos:
+        formatter.linenos = 1
+    else:
+        formatter.linenos = 0
+    formatter.linenostart = abs(int(linestart))
+    formatter.linenostep = abs(int(linestep))
+    formatter.linenospecial = abs(int(linespecial))
+    formatter.hl_lines = set()
+    for lineno in hl_lines:
+        try:
+            formatter.hl_lines.add(int(lineno))
+        except ValueError:
+            pass
+    return formatter
+
+
+# Highlighted code keyed by a hash of the source along with every setting that affects the output, so unchanged blocks
+# are not highlighted again when a document is converted again.
+result_cache = util.LRUCache(max_entries=1024, max_bytes=16 * 1024 * 1024)
+
 if pygments:
     class InlineHtmlFormatter(HtmlFormatter):
         """Format the code blocks."""
@@ -138,10 +211,7 @@ class Highlight(object):
             lexer_options = {}
 
         # Try and get lexer by the name given.
-        try:
-            lexer = get_lexer_by_name(language, **lexer_options)
-        except Exception:
-            lexer = None
+        lexer = get_pooled_lexer(language, lexer_options)
 
         if lexer is None:
             if self.guess_lang:
@@ -150,9 +220,24 @@ class Highlight(object):
                 except Exception:  # pragma: no cover
                     pass
         if lexer is None:
-            lexer = get_lexer_by_name('text')
+            lexer = get_pooled_lexer('text', {})
         return lexer
 
+    def get_cache_key(self, src, language, css_class, hl_lines, linestart, linestep, linespecial, inline):
+        """Get the key of the highlighted code in the result cache, or `None` if it can't be cached."""
+
+        key = (
+            hashlib.sha1(src.encode('utf-8')).hexdigest(), language, css_class,
+            tuple(hl_lines) if hl_lines else None, linestart, linestep, linespecial, bool(inline),
+            self.guess_lang, self.pygments_style, self.noclasses, self.linenums, self.linenums_style,
+            repr(sorted(self.extend_pygments_lang.items()))
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def escape(self, txt):
         """Basic html escaping."""
 
@@ -170,35 +255,43 @@ class Highlight(object):
 
         # Convert with Pygments.
         if pygments and self.use_pygments:
-            # Setup language lexer.
-            lexer = self.get_lexer(src, language)
+            key = self.get_cache_key(src, language, css_class, hl_lines, linestart, linestep, linespecial, inline)
+            code = result_cache.get(key) if key is not None else None
+            if code is None:
+                # Setup language lexer.
+                lexer = self.get_lexer(src, language)
+
+                # Setup line specific settings.
+                linenums = self.linenums_style if (self.linenums or linestart >= 0) and not inline > 0 else False
+                if not linenums or linestep < 1:
+                    linestep = 1
+                if not linenums or linestart < 1:
+                    linestart = 1
+                if not linenums or linespecial < 0:
+                    linespecial = 0
+                if hl_lines is None or inline:
+                    hl_lines = []
+
+                # Setup formatter
+                formatter = get_pooled_formatter(
+                    InlineHtmlFormatter if inline else HtmlFormatter,
+                    css_class,
+                    self.pygments_style,
+                    self.noclasses,
+                    linenums,
+                    linestart,
+                    linestep,
+                    linespecial,
+                    hl_lines
+                )
 
-            # Setup line specific settings.
-            linenums = self.linenums_style if (self.linenums or linestart >= 0) and not inline > 0 else False
-            if not linenums or linestep < 1:
-                linestep = 1
-            if not linenums or linestart < 1:
-                linestart = 1
-            if not linenums or linespecial < 0:
-                linespecial = 0
-            if hl_lines is None or inline:
-                hl_lines = []
-
-            # Setup formatter
-            html_formatter = InlineHtmlFormatter if inline else HtmlFormatter
-            formatter = html_formatter(
-                cssclass=css_class,
-                linenos=linenums,
-                linenostart=linestart,
-                linenostep=linestep,
-                linenospecial=linespecial,
-                style=self.pygments_style,
-                noclasses=self.noclasses,
-                hl_lines=hl_lines
-            )
-
-            # Convert
-            code = highlight(src, lexer, formatter)
+                # Convert
+                code = highlight(src, lexer, formatter)
+                if not inline:
+                    # Cache blocks as they are returned.
+                    code = code.strip()
+                if key is not None:
+                    result_cache.store(key, code, len(code))
             if inline:
                 class_str = css_class
         elif inline:
@@ -261,17 +354,17 @@ class HighlightTreeprocessor(Treeprocessor):
     def run(self, root):
         """Find code blocks and store in `htmlStash`."""
 
+        code = Highlight(
+            guess_lang=self.config['guess_lang'],
+            pygments_style=self.config['pygments_style'],
+            use_pygments=self.config['use_pygments'],
+            noclasses=self.config['noclasses'],
+            linenums=self.config['linenums'],
+            extend_pygments_lang=self.config['extend_pygments_lang']
+        )
         blocks = root.iter('pre')
         for block in blocks:
             if len(block) == 1 and block[0].tag == 'code':
-                code = Highlight(
-                    guess_lang=self.config['guess_lang'],
-                    pygments_style=self.config['pygments_style'],
-                    use_pygments=self.config['use_pygments'],
-                    noclasses=self.config['noclasses'],
-                    linenums=self.config['linenums'],
-                    extend_pygments_lang=self.config['extend_pygments_lang']
-                )
                 placeholder = self.markdown.htmlStash.store(
                     code.highlight(
                         block[0].text,
@@ -71,6 +71,13 @@ class InlineHilitePattern(Pattern):
             self.pygments_style = config['pygments_style']
             self.use_pygments = config['use_pygments']
             self.noclasses = config['noclasses']
+            self.highlighter = hl.Highlight(
+                guess_lang=self.guess_lang,
+                pygments_style=self.pygments_style,
+                use_pygments=self.use_pygments,
+                noclasses=self.noclasses,
+                extend_pygments_lang=self.extend_pygments_lang
+            )
 
     def highlight_code(self, language, src):
         """Syntax highlight the inline code block."""
@@ -78,13 +85,7 @@ class InlineHilitePattern(Pattern):
         process_text = self.style_plain_text or language or self.guess_lang
 
         if process_text:
-            el = hl.Highlight(
-                guess_lang=self.guess_lang,
-                pygments_style=self.pygments_style,
-                use_pygments=self.use_pygments,
-                noclasses=self.noclasses,
-                extend_pygments_lang=self.extend_pygments_lang
-            ).highlight(src, language, self.css_class, inline=True)
+            el = self.highlighter.highlight(src, language, self.css_class, inline=True)
             el.text = self.markdown.htmlStash.store(el.text, safe=True)
         else:
             el = md_util.etree.Element('code')
@@ -149,6 +149,12 @@ RE_REPO_LINK = re.compile(
     '''
 )
 
+# Quick checks for what text must contain before the matching patterns are tried on it
+RE_LINK_PREFILTER = re.compile(r'(?i)://|www\.')
+RE_MENTION_PREFILTER = re.compile(r'@')
+RE_REFS_PREFILTER = re.compile(r'[#!@]')
+RE_MICRO_REFS_PREFILTER = re.compile(r'[#!]|[a-f\d]{40}')
+
 # Provider specific info (links, names, specific patterns, etc.)
 SOCIAL_PROVIDERS = {'twitter'}
 PROVIDER_INFO = {
@@ -190,6 +196,47 @@ PROVIDER_INFO = {
 }
 
 
+class PrefilteredRegExp(object):
+    """
+    Compiled pattern that is only tried on text that passes a quick check.
+
+    Inline patterns are tried on every text node, and most of them are plain prose.  Searching for the characters
+    that every match needs is much cheaper than running the full pattern, so nodes without them are skipped.
+    """
+
+    def __init__(self, regexp, prefilter):
+        """Initialize."""
+
+        self.regexp = regexp
+        self.prefilter = prefilter
+
+    def match(self, string, *args):
+        """Match if the prefilter finds what the pattern needs."""
+
+        if self.prefilter.search(string, *args) is None:
+            return None
+        return self.regexp.match(string, *args)
+
+    def search(self, string, *args):
+        """Search if the prefilter finds what the pattern needs."""
+
+        if self.prefilter.search(string, *args) is None:
+            return None
+        return self.regexp.search(string, *args)
+
+    def __getattr__(self, name):
+        """Look up everything else on the compiled pattern."""
+
+        return getattr(self.regexp, name)
+
+
+def prefilter(pattern, prefilter):
+    """Only try the inline `pattern` on text that the compiled `prefilter` finds something in."""
+
+    pattern.compiled_re = PrefilteredRegExp(pattern.compiled_re, prefilter)
+    return pattern
+
+
 class _MagiclinkShorthandPattern(Pattern):
     """Base shorthand link class."""
 
@@ -410,14 +457,8 @@ class MagicShortenerTreeprocessor(Treeprocessor):
     def get_provider(self, match):
         """Get the provider and hash size."""
 
-        # Set provider specific variables
-        if match.group('github'):
-            provider = 'github'
-        elif match.group('bitbucket'):
-            provider = 'bitbucket'
-        elif match.group('gitlab'):
-            provider = 'gitlab'
-        return provider
+        # The provider's group encloses all others, so it is the last one to close.
+        return match.lastgroup
 
     def get_type(self, provider, match):
         """Get the link type."""
@@ -455,7 +496,7 @@ class MagicShortenerTreeprocessor(Treeprocessor):
 
         links = root.iter('a')
         for link in links:
-            has_child = len(list(link))
+            has_child = len(link)
             is_magic = link.attrib.get('magiclink')
             href = link.attrib.get('href', '')
             text = link.text
@@ -762,15 +803,16 @@ class MagiclinkExtension(Extension):
         """Setup auto links."""
 
         # Setup general link patterns
-        auto_link_pattern = MagiclinkAutoPattern(RE_AUTOLINK, md)
+        auto_link_pattern = prefilter(MagiclinkAutoPattern(RE_AUTOLINK, md), RE_LINK_PREFILTER)
         auto_link_pattern.config = config
         md.inlinePatterns['autolink'] = auto_link_pattern
 
-        link_pattern = MagiclinkPattern(RE_LINK, md)
+        link_pattern = prefilter(MagiclinkPattern(RE_LINK, md), RE_LINK_PREFILTER)
         link_pattern.config = config
         md.inlinePatterns.add("magic-link", link_pattern, "<entity")
 
-        md.inlinePatterns.add("magic-mail", MagiclinkMailPattern(RE_MAIL, md), "<entity")
+        mail_pattern = prefilter(MagiclinkMailPattern(RE_MAIL, md), RE_MENTION_PREFILTER)
+        md.inlinePatterns.add("magic-mail", mail_pattern, "<entity")
 
     def setup_shortener(self, md, base_url, base_user_url, config):
         """Setup shortener."""
@@ -788,41 +830,60 @@ class MagiclinkExtension(Extension):
 
         # Repository shorthand
         if self.git_short:
-            git_ext_repo = MagiclinkRepositoryPattern(
-                RE_GIT_EXT_REPO_MENTIONS, md, self.user, self.repo, self.provider, self.labels
+            git_ext_repo = prefilter(
+                MagiclinkRepositoryPattern(
+                    RE_GIT_EXT_REPO_MENTIONS, md, self.user, self.repo, self.provider, self.labels
+                ),
+                RE_MENTION_PREFILTER
             )
             md.inlinePatterns.add("magic-repo-ext-mention", git_ext_repo, "<entity")
             if not self.is_social:
-                git_int_repo = MagiclinkRepositoryPattern(
-                    RE_GIT_INT_REPO_MENTIONS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+                git_int_repo = prefilter(
+                    MagiclinkRepositoryPattern(
+                        RE_GIT_INT_REPO_MENTIONS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+                    ),
+                    RE_MENTION_PREFILTER
                 )
                 md.inlinePatterns.add("magic-repo-int-mention", git_int_repo, "<entity")
 
         # Mentions
         pattern = RE_ALL_EXT_MENTIONS % '|'.join(ext_mentions)
-        git_mention = MagiclinkMentionPattern(
-            pattern, md, self.user, self.repo, self.provider, self.labels
+        git_mention = prefilter(
+            MagiclinkMentionPattern(pattern, md, self.user, self.repo, self.provider, self.labels),
+            RE_MENTION_PREFILTER
         )
         md.inlinePatterns.add("magic-ext-mention", git_mention, "<entity")
 
-        git_mention = MagiclinkMentionPattern(
-            RE_INT_MENTIONS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+        git_mention = prefilter(
+            MagiclinkMentionPattern(
+                RE_INT_MENTIONS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+            ),
+            RE_MENTION_PREFILTER
         )
         md.inlinePatterns.add("magic-int-mention", git_mention, "<entity")
 
         # Other project refs
         if self.git_short:
-            git_ext_refs = MagiclinkExternalRefsPattern(
-                RE_GIT_EXT_REFS, md, self.user, self.repo, self.provider, self.labels
+            git_ext_refs = prefilter(
+                MagiclinkExternalRefsPattern(
+                    RE_GIT_EXT_REFS, md, self.user, self.repo, self.provider, self.labels
+                ),
+                RE_REFS_PREFILTER
             )
             md.inlinePatterns.add("magic-ext-refs", git_ext_refs, "<entity")
             if not self.is_social:
-                git_int_refs = MagiclinkExternalRefsPattern(
-                    RE_GIT_INT_EXT_REFS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+                git_int_refs = prefilter(
+                    MagiclinkExternalRefsPattern(
+                        RE_GIT_INT_EXT_REFS % int_mentions, md, self.user, self.repo, self.provider, self.labels
+                    ),
+                    RE_REFS_PREFILTER
                 )
                 md.inlinePatterns.add("magic-int-refs", git_int_refs, "<entity")
-                git_int_micro_refs = MagiclinkInternalRefsPattern(
-                    RE_GIT_INT_MICRO_REFS, md, self.user, self.repo, self.provider, self.labels
+                git_int_micro_refs = prefilter(
+                    MagiclinkInternalRefsPattern(
+                        RE_GIT_INT_MICRO_REFS, md, self.user, self.repo, self.provider, self.labels
+                    ),
+                    RE_MICRO_REFS_PREFILTER
                 )
                 md.inlinePatterns.add("magic-int-micro-refs", git_int_micro_refs, "<entity")
 
@@ -37,12 +37,13 @@ from __future__ import unicode_literals
 from markdown import Extension
 from markdown.postprocessors import Postprocessor
 from . import util
+from . import tagrewriter
 import os
 import re
 
 RE_TAG_HTML = r'''(?xus)
     (?:
-        (?P<comments>(\r?\n?\s*)<!--[\s\S]*?-->(\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
+        (?P<comments>(\r?\n?\s*)<!--(?:[^-]|-(?!->))*-->(\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
         (?P<open><(?P<tag>(?:%s)))
         (?P<attr>(?:\s+[\w\-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'))?)*)
         (?P<close>\s*(?:\/?)>)
@@ -122,9 +123,31 @@ def repl(m, base_path, rel_path=None):
     return tag
 
 
-class PathConverterPostprocessor(Postprocessor):
+class PathConverterPostprocessor(Postprocessor, tagrewriter.TagHandler):
     """Post process to find tag lings to convert."""
 
+    @property
+    def active(self):
+        """Check if paths are to be converted."""
+
+        if bool(self.config['absolute']):
+            return bool(self.config['base_path'])
+        return bool(self.config['base_path'] and self.config['relative_path'])
+
+    def tag_names(self):
+        """Rewrite the configured tags."""
+
+        return '|'.join(self.config['tags'].split())
+
+    def rewrite_attrs(self, attrs):
+        """Convert paths in the attributes of a tag."""
+
+        basepath = self.config['base_path']
+        if bool(self.config['absolute']):
+            return RE_TAG_LINK_ATTR.sub(lambda m: repl_absolute(m, basepath), attrs)
+        relativepath = self.config['relative_path']
+        return RE_TAG_LINK_ATTR.sub(lambda m: repl_relative(m, basepath, relativepath), attrs)
+
     def run(self, text):
         """Find and convert paths."""
 
@@ -159,7 +182,7 @@ class PathConverterExtension(Extension):
 
         rel_path = PathConverterPostprocessor(md)
         rel_path.config = self.getConfigs()
-        md.postprocessors.add("path-converter", rel_path, "_end")
+        tagrewriter.add_handler(md, rel_path)
         md.registerExtension(self)
 
 
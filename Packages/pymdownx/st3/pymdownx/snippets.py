@@ -25,11 +25,68 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import unicode_literals
 from markdown import Extension
 from markdown.preprocessors import Preprocessor
+from . import util
 import re
 import codecs
 import os
 
 
+def file_state(path):
+    """Return the modification time and size of a file, or `None` if it can't be accessed."""
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class SnippetCache(object):
+    """
+    LRU cache of expanded snippet files.
+
+    An entry holds the expanded lines of a snippet along with the state of every file it depends on: the snippet
+    itself and all the snippets it includes, directly or not, whether they exist or not.  An entry is dropped as
+    soon as any of them changes.  The cache is bounded by the total length of the lines, and is safe to share
+    between conversions on different threads.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """Initialize."""
+
+        self.entries = util.LRUCache(max_bytes=max_bytes)
+
+    def get(self, key, seen):
+        """Return the cached lines for `key`, or `None` if they are missing, stale or depend on `seen`."""
+
+        def check(entry):
+            """Reject stale entries, and entries that would skip a snippet of the current include stack."""
+
+            deps = entry[1]
+            return seen.isdisjoint(deps) and all(file_state(path) == state for path, state in deps.items())
+
+        return self.entries.get(key, check=check)
+
+    def store(self, key, lines, deps):
+        """Store the expanded lines of a snippet and the state of its dependencies."""
+
+        self.entries.store(key, (lines, deps), sum(len(line) for line in lines))
+
+    def clear(self):
+        """Drop all entries.  Counters are kept."""
+
+        self.entries.clear()
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+
+        return self.entries.stats()
+
+
+# Shared by all Markdown instances, so snippets included by many documents are read once.
+cache = SnippetCache()
+
+
 class SnippetPreprocessor(Preprocessor):
     """Handle snippets in Markdown content."""
 
@@ -59,6 +116,39 @@ class SnippetPreprocessor(Preprocessor):
         self.tab_length = md.tab_length
         super(SnippetPreprocessor, self).__init__()
 
+    def expand_snippet(self, snippet, state):
+        """
+        Read and parse a snippet file.
+
+        Expansions are cached unless they skipped a snippet that was already in the include stack, as those
+        depend on where the snippet is included from.
+        """
+
+        frame = self.frames[-1]
+        key = (snippet, self.base_path, self.encoding, self.tab_length)
+        cached = cache.get(key, self.seen)
+        if cached is not None:
+            lines, deps = cached
+            frame['deps'].update(deps)
+            return lines
+
+        sub_frame = {'deps': {snippet: state}, 'cacheable': True}
+        self.frames.append(sub_frame)
+        try:
+            with codecs.open(snippet, 'r', encoding=self.encoding) as f:
+                lines = self.parse_snippets([l.rstrip('\r\n') for l in f], snippet)
+        except Exception:
+            sub_frame['cacheable'] = False
+            raise
+        finally:
+            self.frames.pop()
+            frame['deps'].update(sub_frame['deps'])
+            if not sub_frame['cacheable']:
+                frame['cacheable'] = False
+        if sub_frame['cacheable']:
+            cache.store(key, lines, sub_frame['deps'])
+        return lines
+
     def parse_snippets(self, lines, file_name=None):
         """Parse snippets snippet."""
 
@@ -107,21 +197,24 @@ class SnippetPreprocessor(Preprocessor):
                     continue
 
                 snippet = os.path.join(self.base_path, path)
-                if snippet and os.path.exists(snippet):
+                state = file_state(snippet) if snippet else None
+                if snippet:
+                    # Also track missing snippets, as they may show up later.
+                    self.frames[-1]['deps'][snippet] = state
+                if state is not None:
                     if snippet in self.seen:
                         # This is in the stack and we don't want an infinite loop!
+                        self.frames[-1]['cacheable'] = False
                         continue
-                    if file_name:
-                        # Track this file.
+                    # Track this file, unless an outer include of it already does.
+                    track = file_name and file_name not in self.seen
+                    if track:
                         self.seen.add(file_name)
                     try:
-                        with codecs.open(snippet, 'r', encoding=self.encoding) as f:
-                            new_lines.extend(
-                                [space + l2 for l2 in self.parse_snippets([l.rstrip('\r\n') for l in f], snippet)]
-                            )
+                        new_lines.extend([space + l2 for l2 in self.expand_snippet(snippet, state)])
                     except Exception:  # pragma: no cover
                         pass
-                    if file_name:
+                    if track:
                         self.seen.remove(file_name)
 
         return new_lines
@@ -130,6 +223,7 @@ class SnippetPreprocessor(Preprocessor):
         """Process snippets."""
 
         self.seen = set()
+        self.frames = [{'deps': {}, 'cacheable': True}]
         return self.parse_snippets(lines)
 
 
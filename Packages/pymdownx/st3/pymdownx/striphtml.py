@@ -26,13 +26,14 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import unicode_literals
 from markdown import Extension
 from markdown.postprocessors import Postprocessor
+from . import tagrewriter
 import re
 
 
 RE_TAG_HTML = re.compile(
     r'''(?x)
     (?:
-        (?P<comments>(?:\r?\n?\s*)<!--[\s\S]*?-->(?:\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
+        (?P<comments>(?:\r?\n?\s*)<!--(?:[^-]|-(?!->))*-->(?:\s*)(?=\r?\n)|<!--[\s\S]*?-->)|
         (?P<scripts>
             (?P<script_open><(?P<script_name>style|script))
             (?P<script_attr>(?:\s+[\w\-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'`=<>]+))?)*)
@@ -57,9 +58,12 @@ TAG_BAD_ATTR = r'''(?x)
 '''
 
 
-class StripHtmlPostprocessor(Postprocessor):
+class StripHtmlPostprocessor(Postprocessor, tagrewriter.TagHandler):
     """Post processor to strip out unwanted content."""
 
+    quoted_only = False
+    script_blocks = True
+
     def __init__(self, strip_comments, strip_js_on_attributes, strip_attributes, md):
         """Initialize."""
 
@@ -73,6 +77,7 @@ class StripHtmlPostprocessor(Postprocessor):
                 TAG_BAD_ATTR % '|'.join(attributes),
                 re.DOTALL | re.UNICODE
             )
+        self.active = bool(self.strip_comments or self.re_attributes)
 
         super(StripHtmlPostprocessor, self).__init__(md)
 
@@ -100,11 +105,20 @@ class StripHtmlPostprocessor(Postprocessor):
                 tag += m.group('close')
         return tag
 
+    def rewrite_attrs(self, attrs):
+        """Strip unwanted attributes of a tag."""
+
+        return self.re_attributes.sub('', attrs) if self.re_attributes is not None else attrs
+
+    def rewrite_comment(self, comment):
+        """Strip comments."""
+
+        return '' if self.strip_comments else comment
+
     def run(self, text):
         """Strip out ids and classes for a simplified HTML output."""
 
-        strip = self.strip_comments or self.strip_js_on_attributes or self.re_attributes
-        return RE_TAG_HTML.sub(self.repl, text) if strip else text
+        return RE_TAG_HTML.sub(self.repl, text) if self.active else text
 
 
 class StripHtmlExtension(Extension):
@@ -142,7 +156,7 @@ class StripHtmlExtension(Extension):
             config.get('strip_attributes'),
             md
         )
-        md.postprocessors.add("strip-html", striphtml, "_end")
+        tagrewriter.add_handler(md, striphtml)
         md.registerExtension(self)
 
 
@@ -37,6 +37,11 @@ from markdown.blockprocessors import CodeBlockProcessor
 from markdown import util as md_util
 from . import highlight as hl
 import re
+import threading
+try:
+    from concurrent import futures
+except ImportError:  # pragma: no cover
+    futures = None
 
 SOH = '\u0001'
 EOT = '\u0004'
@@ -69,6 +74,70 @@ TAB = r'''<superfences><input name="__tabs_%%(index)s" type="radio" id="__tab_%%
 
 NESTED_FENCE_END = r'%s[ \t]*$'
 
+# Compiled fence end patterns by fence.
+fence_end_patterns = {}
+
+
+# The pool for `highlight_workers` by kind and number of workers, shared by all Markdown instances.
+# Only one pool is kept: asking for another kind or size shuts the current one down.
+executors = {}
+executors_lock = threading.Lock()
+
+# `Highlight` objects of a worker by their settings.
+highlighters = {}
+
+
+def _shutdown_executors():
+    """
+    Shut down the pools; queued blocks are still highlighted.
+
+    Thread pools are left to finish in the background.  Process pools are waited for, as a process pool that is
+    still running after `shutdown` fails when the interpreter exits on some Python versions.
+    """
+
+    for (kind, workers), executor in executors.items():
+        executor.shutdown(wait=kind == 'process')
+    executors.clear()
+
+
+def get_executor(kind, workers):
+    """Get the shared pool of the given kind (`thread` or `process`) and size."""
+
+    key = (kind, workers)
+    with executors_lock:
+        executor = executors.get(key)
+        if executor is None:
+            _shutdown_executors()
+            pool = futures.ProcessPoolExecutor if kind == 'process' else futures.ThreadPoolExecutor
+            executor = executors[key] = pool(max_workers=workers)
+        return executor
+
+
+def shutdown_executors():
+    """Shut down the shared pool, for instance when the plugin is unloaded; the next conversion starts a new one."""
+
+    with executors_lock:
+        _shutdown_executors()
+
+
+def highlight_job(settings, options):
+    """Highlight a block in a pool worker."""
+
+    key = repr(sorted(settings.items()))
+    highlighter = highlighters.get(key)
+    if highlighter is None:
+        highlighter = highlighters[key] = hl.Highlight(**settings)
+    return highlighter.highlight(**options)
+
+
+def get_fence_end(fence):
+    """Get the compiled pattern that ends the given fence."""
+
+    pattern = fence_end_patterns.get(fence)
+    if pattern is None:
+        pattern = fence_end_patterns[fence] = re.compile(NESTED_FENCE_END % fence)
+    return pattern
+
 
 def _escape(txt):
     """Basic html escaping."""
@@ -156,7 +225,17 @@ class SuperFencesCodeExtension(Extension):
                 "if nothing is set. - "
                 "Default: ''"
             ],
-            'preserve_tabs': [False, "Preserve tabs in fences - Default: False"]
+            'preserve_tabs': [False, "Preserve tabs in fences - Default: False"],
+            'highlight_workers': [
+                0,
+                "Number of workers used to highlight fenced blocks in parallel with Pygments. "
+                "0 highlights each block as it is found - Default: 0"
+            ],
+            'highlight_executor': [
+                'thread',
+                "Kind of pool used by 'highlight_workers': 'thread' or 'process'. "
+                "Process pools need an interpreter that can start subprocesses - Default: 'thread'"
+            ]
         }
         super(SuperFencesCodeExtension, self).__init__(*args, **kwargs)
 
@@ -230,6 +309,10 @@ class SuperFencesCodeExtension(Extension):
         else:
             self.markdown.preprocessors.add('fenced_code_block', fenced, ">normalize_whitespace")
         self.markdown.postprocessors.add('fenced_tabs', SuperFencesTabPostProcessor(self.markdown), '>raw_html')
+        if config['highlight_workers'] and futures is not None:
+            highlighted = SuperFencesHighlightPostprocessor(self.markdown)
+            highlighted.fenced = fenced
+            self.markdown.postprocessors.add('fenced_highlight', highlighted, '<raw_html')
 
     def reset(self):
         """Clear the stash."""
@@ -266,6 +349,30 @@ class SuperFencesTabPostProcessor(Postprocessor):
         return RE_TABS.sub(self.repl, text)
 
 
+class SuperFencesHighlightPostprocessor(Postprocessor):
+    """Put the blocks highlighted by the pool in the HTML stash, in document order."""
+
+    def run(self, text):
+        """Wait for the highlighted blocks and replace their markers."""
+
+        stash = self.markdown.htmlStash
+        for index, marker, job, options, key, tab in self.fenced.deferred:
+            try:
+                code = job.result()
+            except Exception:
+                # The pool failed (a broken process pool for instance), so highlight it here.
+                code = self.fenced.highlighter.highlight(**options)
+            else:
+                if key is not None:
+                    hl.result_cache.store(key, code, len(code))
+            if tab:
+                code = code.replace('%', '%%')
+            html, safe = stash.rawHtmlBlocks[index]
+            stash.rawHtmlBlocks[index] = (html.replace(marker, code), safe)
+        self.fenced.deferred = []
+        return text
+
+
 class SuperFencesBlockPostNormalizePreprocessor(Preprocessor):
     """Preprocessor to clean up normalization bypass hack."""
 
@@ -307,6 +414,10 @@ class SuperFencesBlockPreprocessor(Preprocessor):
         self.tab_len = self.markdown.tab_length
         self.checked_hl_settings = False
         self.codehilite_conf = {}
+        self.workers = 0
+        self.executor = None
+        self.deferred = []
+        self.job = None
 
     def normalize_ws(self, text):
         """Normalize whitespace."""
@@ -335,6 +446,20 @@ class SuperFencesBlockPreprocessor(Preprocessor):
             self.use_pygments = config['use_pygments']
             self.noclasses = config['noclasses']
             self.linenums = config['linenums']
+            self.hl_settings = {
+                'guess_lang': self.guess_lang,
+                'pygments_style': self.pygments_style,
+                'use_pygments': self.use_pygments,
+                'noclasses': self.noclasses,
+                'linenums': self.linenums,
+                'extend_pygments_lang': self.extend_pygments_lang
+            }
+            self.highlighter = hl.Highlight(**self.hl_settings)
+
+            # Only Pygments is worth a pool.
+            self.workers = self.config['highlight_workers']
+            if futures is None or not hl.pygments or not self.use_pygments:
+                self.workers = 0
 
     def clear(self):
         """Reset the class variables."""
@@ -408,6 +533,7 @@ class SuperFencesBlockPreprocessor(Preprocessor):
 
         self.last = ws + self.normalize_ws(content)
         code = None
+        self.job = None
         for entry in reversed(self.extension.superfences):
             if entry["test"](self.lang):
                 code = entry["formatter"](self.rebuild_block(self.code), self.lang)
@@ -417,6 +543,11 @@ class SuperFencesBlockPreprocessor(Preprocessor):
 
         if code is not None:
             self._store(self.normalize_ws('\n'.join(self.code)) + '\n', code, start, end, entry)
+            if self.job is not None:
+                # Note which stash entry gets the highlighted code.
+                index = len(self.markdown.htmlStash.rawHtmlBlocks) - 1
+                self.deferred.append((index,) + self.job + (self.tab is not None,))
+        self.job = None
         self.clear()
 
     def parse_hl_lines(self, hl_lines):
@@ -505,7 +636,7 @@ class SuperFencesBlockPreprocessor(Preprocessor):
                     self.linestart = m.group('linestart')
                     self.linestep = m.group('linestep')
                     self.linespecial = m.group('linespecial')
-                    self.fence_end = re.compile(NESTED_FENCE_END % self.fence)
+                    self.fence_end = get_fence_end(self.fence)
                     if m.group('tab'):
                         self.tab = m.group('tab_title')
                         if not self.tab:
@@ -541,14 +672,40 @@ class SuperFencesBlockPreprocessor(Preprocessor):
 
         # Now that we are done iterating the lines,
         # let's replace the original content with the
-        # fenced blocks.
-        while len(self.stack):
-            fenced, start, end = self.stack.pop()
+        # fenced blocks.  The blocks are in order and don't overlap.
+        if not self.stack:
+            return lines
+        new_lines = []
+        index = 0
+        for fenced, start, end in self.stack:
+            new_lines.extend(lines[index:start])
             if self.preserve_tabs:
-                lines = lines[:start] + [fenced.replace(md_util.STX, SOH, 1)[:-1] + EOT] + lines[end:]
+                new_lines.append(fenced.replace(md_util.STX, SOH, 1)[:-1] + EOT)
             else:
-                lines = lines[:start] + [fenced] + lines[end:]
-        return lines
+                new_lines.append(fenced)
+            index = end
+        new_lines.extend(lines[index:])
+        return new_lines
+
+    def submit(self, options):
+        """
+        Queue a block to be highlighted by the pool and return a marker for the result.
+
+        Blocks that are in the result cache are returned right away.
+        """
+
+        key = self.highlighter.get_cache_key(inline=False, **options)
+        code = hl.result_cache.get(key) if key is not None else None
+        if code is not None:
+            return code
+        try:
+            job = self.executor.submit(highlight_job, self.hl_settings, options)
+        except RuntimeError:
+            # The pool was shut down or is broken, so highlight the block here.
+            return self.highlighter.highlight(**options)
+        marker = '%shighlight:%d%s' % (md_util.STX, len(self.deferred), md_util.ETX)
+        self.job = (marker, job, options, key)
+        return marker
 
     def highlight(self, src, language):
         """
@@ -564,14 +721,20 @@ class SuperFencesBlockPreprocessor(Preprocessor):
             linespecial = self.parse_line_special(self.linespecial)
             hl_lines = self.parse_hl_lines(self.hl_lines)
 
-            el = hl.Highlight(
-                guess_lang=self.guess_lang,
-                pygments_style=self.pygments_style,
-                use_pygments=self.use_pygments,
-                noclasses=self.noclasses,
-                linenums=self.linenums,
-                extend_pygments_lang=self.extend_pygments_lang
-            ).highlight(
+            if self.executor is not None:
+                return self.submit(
+                    {
+                        'src': src,
+                        'language': language,
+                        'css_class': self.css_class,
+                        'hl_lines': hl_lines,
+                        'linestart': linestart,
+                        'linestep': linestep,
+                        'linespecial': linespecial
+                    }
+                )
+
+            el = self.highlighter.highlight(
                 src,
                 language,
                 self.css_class,
@@ -607,8 +770,11 @@ class SuperFencesBlockPreprocessor(Preprocessor):
         """Search for fenced blocks."""
 
         self.get_hl_settings()
+        # Get the pool for every document, as it may have been replaced or shut down since.
+        self.executor = get_executor(self.config['highlight_executor'], self.workers) if self.workers else None
         self.clear()
         self.stack = []
+        self.deferred = []
         self.disabled_indented = self.config.get("disable_indented_code_blocks", False)
         self.preserve_tabs = self.config.get("preserve_tabs", False)
 
@@ -0,0 +1,185 @@
+"""
+Tag rewriter.
+
+pymdownx.tagrewriter
+Shared postprocessor that rewrites the attributes of HTML tags in a single pass.
+
+Extensions like `b64`, `pathconverter` and `striphtml` rewrite tag attributes in the final HTML.  Instead of each
+one running its own substitution over the whole output, they register a handler with `add_handler`, and the
+`TagRewriter` postprocessor tokenizes the output once and hands each tag to the handlers in registration order.
+
+A handler (see `TagHandler`) provides:
+
+- `active`: whether the handler has anything to do.
+- `quoted_only`: whether its own tokenizer only accepts quoted attribute values.  Tags with unquoted values are
+  then skipped for this handler, as its tokenizer would not have matched them.
+- `script_blocks`: whether its own tokenizer treats `script` and `style` blocks as a whole, so that their
+  content is not scanned for tags.
+- `tag_names()`: a regular expression matching the names of the tags it rewrites, or `None` for all tags.
+- `rewrite_attrs(attrs)`: the rewritten attribute string of a tag.
+- `rewrite_comment(comment)`: the rewritten comment.
+- `run(text)`: the handler's own single pass over some HTML.  This is used for the rare tags whose attribute values
+  contain tags, and for script blocks, so that the output stays exactly what the separate passes produced.
+
+MIT license.
+
+Copyright (c) 2017 Isaac Muse <isaacmuse@gmail.com>
+"""
+from __future__ import unicode_literals
+from markdown.postprocessors import Postprocessor
+import re
+
+RE_ATTRS_QUOTED = r'''(?:\s+[\w\-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'))?)*'''
+RE_ATTRS_ANY = r'''(?:\s+[\w\-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'`=<>]+))?)*'''
+
+RE_COMMENTS = r'''(?P<comments>(?:\r?\n?\s*)<!--(?:[^-]|-(?!->))*-->(?:\s*)(?=\r?\n)|<!--[\s\S]*?-->)'''
+
+RE_SCRIPTS = r'''
+    (?P<scripts>
+        <(?P<script_name>style|script)
+        %s
+        \s*>.*?</(?P=script_name)\s*>
+    )
+    '''
+
+RE_TAG = r'''
+    (?P<open><(?P<name>%s))
+    (?P<attr>%s)
+    (?P<close>\s*(?:/)?>)
+    '''
+
+RE_ALL_NAMES = r'[\w\:\.\-]+'
+
+QUOTED_ATTRS = re.compile(RE_ATTRS_QUOTED + '$', re.DOTALL | re.UNICODE)
+
+
+class TagHandler(object):
+    """Defaults for tag handlers: rewrite nothing."""
+
+    active = True
+    quoted_only = True
+    script_blocks = False
+
+    def tag_names(self):
+        """Return a pattern for the names of the tags to rewrite, or `None` for all tags."""
+
+        return None
+
+    def rewrite_attrs(self, attrs):
+        """Return the rewritten attributes of a tag."""
+
+        return attrs
+
+    def rewrite_comment(self, comment):
+        """Return the rewritten comment."""
+
+        return comment
+
+    def run(self, text):
+        """Rewrite all tags in `text`."""
+
+        return text
+
+
+class TagRewriter(Postprocessor):
+    """Rewrite tag attributes for all registered handlers in one pass."""
+
+    def __init__(self, md):
+        """Initialize."""
+
+        super(TagRewriter, self).__init__(md)
+        self.handlers = []
+        self.pattern = None
+
+    def add_handler(self, handler):
+        """Add a handler; handlers run in the order they are added."""
+
+        self.handlers.append(handler)
+        self.pattern = None
+
+    def compile(self):
+        """Build the tokenizer for the active handlers."""
+
+        handlers = [handler for handler in self.handlers if handler.active]
+        self.active = handlers
+        self.tag_handlers = []
+        names = []
+        all_names = False
+        for handler in handlers:
+            tag_names = handler.tag_names()
+            if tag_names is None:
+                all_names = True
+                matcher = None
+            else:
+                names.append('(?:%s)' % tag_names)
+                matcher = re.compile('(?:%s)$' % tag_names, re.DOTALL | re.UNICODE)
+            self.tag_handlers.append((handler, matcher))
+
+        self.any_attrs = any(not handler.quoted_only for handler in handlers)
+        self.script_blocks = any(handler.script_blocks for handler in handlers)
+        attrs = RE_ATTRS_ANY if self.any_attrs else RE_ATTRS_QUOTED
+        alternatives = [RE_COMMENTS]
+        if self.script_blocks:
+            alternatives.append(RE_SCRIPTS % attrs)
+        if all_names or names:
+            alternatives.append(RE_TAG % (RE_ALL_NAMES if all_names else '|'.join(names), attrs))
+        self.pattern = re.compile(
+            '(?:%s)' % '|'.join(alternatives), re.DOTALL | re.UNICODE | re.VERBOSE
+        )
+
+    def run_all(self, text):
+        """Run each handler's own pass over `text`."""
+
+        for handler in self.active:
+            text = handler.run(text)
+        return text
+
+    def repl(self, m):
+        """Rewrite a comment or tag."""
+
+        comment = m.group('comments')
+        if comment is not None:
+            for handler in self.active:
+                comment = handler.rewrite_comment(comment)
+            return comment
+
+        if self.script_blocks and m.group('scripts') is not None:
+            return self.run_all(m.group(0))
+
+        attrs = m.group('attr')
+        if '<' in attrs:
+            # Other handlers may find tags within the attribute values.
+            return self.run_all(m.group(0))
+
+        name = m.group('name')
+        quoted = None
+        for handler, matcher in self.tag_handlers:
+            if matcher is not None and matcher.match(name) is None:
+                continue
+            if handler.quoted_only and self.any_attrs:
+                if quoted is None:
+                    quoted = QUOTED_ATTRS.match(attrs) is not None
+                if not quoted:
+                    continue
+            rewritten = handler.rewrite_attrs(attrs)
+            if rewritten != attrs:
+                attrs = rewritten
+                quoted = None
+        return m.group('open') + attrs + m.group('close')
+
+    def run(self, text):
+        """Rewrite the tags of the document."""
+
+        if self.pattern is None:
+            self.compile()
+        if not self.active:
+            return text
+        return self.pattern.sub(self.repl, text)
+
+
+def add_handler(md, handler):
+    """Register a tag handler with the tag rewriter of `md`, adding the rewriter if needed."""
+
+    if "tag-rewriter" not in md.postprocessors:
+        md.postprocessors.add("tag-rewriter", TagRewriter(md), "_end")
+    md.postprocessors["tag-rewriter"].add_handler(handler)
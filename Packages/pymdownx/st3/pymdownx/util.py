@@ -6,9 +6,11 @@ MIT license.
 Copyright (c) 2017 Isaac Muse <isaacmuse@gmail.com>
 """
 from __future__ import unicode_literals
+from collections import OrderedDict
 import sys
 import copy
 import re
+import threading
 
 PY3 = sys.version_info >= (3, 0)
 PY34 = sys.version_info >= (3, 4)
@@ -176,5 +178,93 @@ def parse_url(url):
     return (scheme, netloc, path, params, query, fragment, is_url, is_absolute)
 
 
+class LRUCache(object):
+    """
+    Thread safe mapping that drops the least recently used entries.
+
+    It can be bounded by the number of entries (`max_entries`) and by the total size of the entries (`max_bytes`),
+    where sizes are given when storing an entry.  `None` means no limit.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        """Initialize."""
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of entries."""
+
+        return len(self.entries)
+
+    def get(self, key, default=None, check=None):
+        """
+        Return the value of `key`, or `default` if there is none.
+
+        If `check` is given, it is called with the value, and a value it rejects is dropped and counted as a miss.
+        """
+
+        with self.lock:
+            try:
+                value = self.entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if check is not None and not check(value):
+                self.size -= self.sizes.pop(key)
+                self.misses += 1
+                return default
+            # Mark as most recently used.
+            self.entries[key] = value
+            self.hits += 1
+            return value
+
+    def store(self, key, value, size=0):
+        """Store `value` under `key`, evicting old entries as needed."""
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                del self.entries[key]
+                self.size -= self.sizes.pop(key)
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.size += size
+            while self.entries and (
+                (self.max_entries is not None and len(self.entries) > self.max_entries) or
+                (self.max_bytes is not None and self.size > self.max_bytes)
+            ):
+                old_key = self.entries.popitem(last=False)[0]
+                self.size -= self.sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries.  Counters are kept."""
+
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+
+        return {
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
 class PymdownxDeprecationWarning(UserWarning):  # pragma: no cover
     """Deprecation warning for Pymdownx that is not hidden."""
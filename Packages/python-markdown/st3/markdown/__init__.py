@@ -34,6 +34,8 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from .__version__ import version, version_info  # noqa
 import codecs
+import io
+import itertools
 import sys
 import logging
 import warnings
@@ -46,12 +48,18 @@ from .inlinepatterns import build_inlinepatterns
 from .postprocessors import build_postprocessors
 from .extensions import Extension
 from .serializers import to_html_string, to_xhtml_string
+from .profiler import Profiler
+from .cache import ConversionCache
 
 __all__ = ['Markdown', 'markdown', 'markdownFromFile']
 
 
 logger = logging.getLogger('MARKDOWN')
 
+# Extension modules resolved by name, along with the deprecation warning to
+# issue when they are used, shared by all Markdown instances.
+_extension_modules = {}
+
 
 class Markdown(object):
     """Convert Markdown to HTML."""
@@ -106,6 +114,10 @@ class Markdown(object):
         * enable_attributes: Enable the conversion of attributes. Default: True
         * smart_emphasis: Treat `_connected_words_` intelligently Default: True
         * lazy_ol: Ignore number of first item of ordered lists. Default: True
+        * profile: Record time and counters per registered processor in
+          `self.profiler` (see `markdown.profiler`). Default: False
+        * cache: A `markdown.cache.ConversionCache` to look up and store
+          results of `convert`, or True for a private one. Default: None
 
         """
 
@@ -148,6 +160,7 @@ class Markdown(object):
                               '(', ')', '>', '#', '+', '-', '.', '!']
 
         self.registeredExtensions = []
+        self.loadedExtensions = []
         self.docType = ""
         self.stripTopLevelTags = True
 
@@ -160,6 +173,14 @@ class Markdown(object):
         self.set_output_format(kwargs.get('output_format', 'xhtml1'))
         self.reset()
 
+        self.profiler = None
+        if kwargs.get('profile', False):
+            self.profiler = Profiler(self)
+
+        self.cache = kwargs.get('cache', None)
+        if self.cache is True:
+            self.cache = ConversionCache()
+
     def build_parser(self):
         """ Build the parser from the various parts. """
         self.preprocessors = build_preprocessors(self)
@@ -185,6 +206,7 @@ class Markdown(object):
                 ext = self.build_extension(ext, configs.get(ext, {}))
             if isinstance(ext, Extension):
                 ext.extendMarkdown(self, globals())
+                self.loadedExtensions.append(ext)
                 logger.debug(
                     'Successfully loaded extension "%s.%s".'
                     % (ext.__class__.__module__, ext.__class__.__name__)
@@ -225,6 +247,40 @@ class Markdown(object):
         ext_name, class_name = ext_name.split(':', 1) \
             if ':' in ext_name else (ext_name, '')
 
+        # Each name is only looked up once.
+        key = (ext_name, class_name)
+        try:
+            module, message = _extension_modules[key]
+        except KeyError:
+            module, message = self._import_extension(ext_name, class_name)
+            _extension_modules[key] = (module, message)
+        if message:
+            warnings.warn(message, DeprecationWarning)
+
+        if class_name:
+            # Load given class name from module.
+            return getattr(module, class_name)(**configs)
+        else:
+            # Expect  makeExtension() function to return a class.
+            try:
+                return module.makeExtension(**configs)
+            except AttributeError as e:
+                message = e.args[0]
+                message = "Failed to initiate extension " \
+                          "'%s': %s" % (ext_name, message)
+                e.args = (message,) + e.args[1:]
+                raise
+
+    def _import_extension(self, ext_name, class_name):
+        """
+        Import the module of an extension.
+
+        Returns a `(module, message)` tuple, where `message` is the
+        deprecation warning to issue if the module was found under an old
+        style name, or `None`.
+
+        """
+        message = None
         # Try loading the extension first from one place, then another
         try:
             # Assume string uses dot syntax (`path.to.some.module`)
@@ -248,15 +304,14 @@ class Markdown(object):
                     'Successfuly imported extension module "%s".' %
                     module_name
                 )
-                warnings.warn('Using short names for Markdown\'s builtin '
-                              'extensions is deprecated. Use the '
-                              'full path to the extension with Python\'s dot '
-                              'notation (eg: "%s" instead of "%s"). The '
-                              'current behavior will raise an error in version '
-                              '2.7. See the Release Notes for '
-                              'Python-Markdown version 2.6 for more info.' %
-                              (module_name, ext_name),
-                              DeprecationWarning)
+                message = ('Using short names for Markdown\'s builtin '
+                           'extensions is deprecated. Use the '
+                           'full path to the extension with Python\'s dot '
+                           'notation (eg: "%s" instead of "%s"). The '
+                           'current behavior will raise an error in version '
+                           '2.7. See the Release Notes for '
+                           'Python-Markdown version 2.6 for more info.' %
+                           (module_name, ext_name))
             except ImportError:
                 # Preppend `mdx_` to name
                 module_name_old_style = '_'.join(['mdx', ext_name])
@@ -265,16 +320,15 @@ class Markdown(object):
                     logger.debug(
                         'Successfuly imported extension module "%s".' %
                         module_name_old_style)
-                    warnings.warn('Markdown\'s behavior of prepending "mdx_" '
-                                  'to an extension name is deprecated. '
-                                  'Use the full path to the '
-                                  'extension with Python\'s dot notation '
-                                  '(eg: "%s" instead of "%s"). The current '
-                                  'behavior will raise an error in version 2.7. '
-                                  'See the Release Notes for Python-Markdown '
-                                  'version 2.6 for more info.' %
-                                  (module_name_old_style, ext_name),
-                                  DeprecationWarning)
+                    message = ('Markdown\'s behavior of prepending "mdx_" '
+                               'to an extension name is deprecated. '
+                               'Use the full path to the '
+                               'extension with Python\'s dot notation '
+                               '(eg: "%s" instead of "%s"). The current '
+                               'behavior will raise an error in version 2.7. '
+                               'See the Release Notes for Python-Markdown '
+                               'version 2.6 for more info.' %
+                               (module_name_old_style, ext_name))
                 except ImportError as e:
                     message = "Failed loading extension '%s' from '%s', '%s' " \
                         "or '%s'" % (ext_name, ext_name, module_name,
@@ -282,19 +336,7 @@ class Markdown(object):
                     e.args = (message,) + e.args[1:]
                     raise
 
-        if class_name:
-            # Load given class name from module.
-            return getattr(module, class_name)(**configs)
-        else:
-            # Expect  makeExtension() function to return a class.
-            try:
-                return module.makeExtension(**configs)
-            except AttributeError as e:
-                message = e.args[0]
-                message = "Failed to initiate extension " \
-                          "'%s': %s" % (ext_name, message)
-                e.args = (message,) + e.args[1:]
-                raise
+        return module, message
 
     def registerExtension(self, extension):
         """ This gets called by the extension """
@@ -362,6 +404,13 @@ class Markdown(object):
             e.reason += '. -- Note: Markdown only accepts unicode input!'
             raise
 
+        if self.cache is not None:
+            key = self.cache.get_key(self, source)
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.restore(self, entry)
+                return entry.html
+
         # Split into lines and run the line preprocessors.
         self.lines = source.split("\n")
         for prep in self.preprocessors.values():
@@ -397,7 +446,10 @@ class Markdown(object):
         for pp in self.postprocessors.values():
             output = pp.run(output)
 
-        return output.strip()
+        output = output.strip()
+        if self.cache is not None:
+            self.cache.store(key, self, output)
+        return output
 
     def convertFile(self, input=None, output=None, encoding=None):
         """Converts a Markdown file and returns the HTML as a Unicode string.
@@ -465,6 +517,84 @@ class Markdown(object):
 
         return self
 
+    def read_meta(self, source):
+        """
+        Return the meta-data of a Markdown document without converting it.
+
+        Only the lines up to the end of the meta-data are looked at.  They are
+        parsed by the preprocessor of the `meta` extension, using its
+        configuration if the extension is loaded.  The result is also stored
+        in `Meta`.
+
+        Keyword arguments:
+
+        * source: Source text as a Unicode string.
+
+        """
+        return self._read_meta(
+            io.StringIO(util.text_type(source), newline=None)
+        )
+
+    def read_meta_file(self, input, encoding=None):
+        """
+        Return the meta-data of a Markdown file without converting it.
+
+        The file is read through a buffer and only up to the end of the
+        meta-data, so this is cheap even for large files.  See `read_meta`.
+
+        Keyword arguments:
+
+        * input: File object or path.
+        * encoding: Encoding of the input file. Defaults to utf-8.
+
+        """
+        encoding = encoding or "utf-8"
+        if isinstance(input, util.string_type):
+            with io.open(input, mode="r", encoding=encoding) as input_file:
+                return self._read_meta(input_file, True)
+        return self._read_meta(self._read_lines(input, encoding), True)
+
+    def _read_lines(self, input_file, encoding, size=8192):
+        """
+        Yield the lines of a binary file object.
+
+        Lines are split on "\n", "\r\n" and "\r" only, the same as
+        `convert` and `read_meta` do.
+
+        """
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(encoding)(), True
+        )
+        pending = ''
+        while True:
+            data = input_file.read(size)
+            lines = (pending + decoder.decode(data, not data)).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line
+            if not data:
+                break
+        if pending:
+            yield pending
+
+    def _read_meta(self, lines, strip_bom=False):
+        """ Parse the meta-data of an iterable of raw lines. """
+        try:
+            meta = self.preprocessors['meta']
+        except KeyError:
+            from .extensions.meta import MetaPreprocessor
+            meta = MetaPreprocessor(self)
+        lines = meta.normalize(lines)
+        first = next(lines, None)
+        if first is None:
+            self.Meta = {}
+        else:
+            if strip_bom:
+                # Remove the byte-order mark, as convertFile does
+                first = first.lstrip('\ufeff')
+            self.Meta = meta.parse(itertools.chain([first], lines))[0]
+        return self.Meta
+
 
 """
 EXPORTED FUNCTIONS
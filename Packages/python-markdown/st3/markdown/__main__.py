@@ -5,6 +5,7 @@ COMMAND-LINE SPECIFIC STUFF
 """
 
 import sys
+import os
 import optparse
 import codecs
 import warnings
@@ -25,7 +26,9 @@ def parse_options(args=None, values=None):
     Define and parse `optparse` options for command-line usage.
     """
     usage = """%prog [options] [INPUTFILE]
-       (STDIN is assumed if no INPUTFILE is given)"""
+       (STDIN is assumed if no INPUTFILE is given)
+       %prog [options] INPUT [INPUT ...]
+       (batch mode: INPUTs are files or directories of Markdown files)"""
     desc = "A Python implementation of John Gruber's Markdown. " \
            "https://Python-Markdown.github.io/"
     ver = "%%prog %s" % markdown.version
@@ -59,6 +62,20 @@ def parse_options(args=None, values=None):
                       "class. The extensions must also be loaded with the "
                       "`--extension` option.",
                       metavar="CONFIG_FILE")
+    parser.add_option("-p", "--profile", dest="profile",
+                      action='store_true', default=False,
+                      help="Print time and counters per processor to STDERR.")
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", default=1,
+                      help="Batch mode: number of worker processes. "
+                      "Defaults to 1.", metavar="JOBS")
+    parser.add_option("-d", "--output_dir", dest="output_dir", default=None,
+                      help="Batch mode: write HTML files to OUTPUT_DIR "
+                      "instead of alongside the inputs.",
+                      metavar="OUTPUT_DIR")
+    parser.add_option("--force", dest="force", action='store_true',
+                      default=False,
+                      help="Batch mode: convert files even if the HTML file "
+                      "is newer than the input.")
     parser.add_option("-q", "--quiet", default=CRITICAL,
                       action="store_const", const=CRITICAL+10, dest="verbose",
                       help="Suppress all warnings.")
@@ -99,13 +116,27 @@ def parse_options(args=None, values=None):
         'extension_configs': extension_configs,
         'encoding': options.encoding,
         'output_format': options.output_format,
-        'lazy_ol': options.lazy_ol
+        'lazy_ol': options.lazy_ol,
+        'profile': options.profile
     }
 
     if options.safe:
         # Avoid deprecation warning if user didn't set option
         opts['safe_mode'] = options.safe
 
+    if (len(args) > 1 or options.output_dir or
+            (input_file and os.path.isdir(input_file))):
+        # Batch mode
+        if options.profile:
+            parser.error("--profile is not supported in batch mode.")
+        if options.filename:
+            parser.error("--file is not supported in batch mode; "
+                         "use --output_dir.")
+        opts['inputs'] = args
+        opts['jobs'] = options.jobs
+        opts['output_dir'] = options.output_dir
+        opts['force'] = options.force
+
     return opts, options.verbose
 
 
@@ -127,7 +158,19 @@ def run():  # pragma: no cover
         warn_logger.addHandler(console_handler)
 
     # Run
-    markdown.markdownFromFile(**options)
+    if 'inputs' in options:
+        from markdown.batch import convert_batch
+        inputs = options.pop('inputs')
+        for key in ('input', 'output', 'profile'):
+            del options[key]
+        convert_batch(inputs, stream=sys.stderr, **options)
+    elif options['profile']:
+        md = markdown.Markdown(**options)
+        md.convertFile(options['input'], options['output'],
+                       options['encoding'])
+        sys.stderr.write(md.profiler.format_report())
+    else:
+        markdown.markdownFromFile(**options)
 
 
 if __name__ == '__main__':  # pragma: no cover
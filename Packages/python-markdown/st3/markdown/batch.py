@@ -0,0 +1,173 @@
+"""
+BATCH CONVERSION
+=============================================================================
+
+Convert many Markdown files at once, optionally spread over several worker
+processes.  Each worker builds a single Markdown instance and reuses it (via
+`reset()`) for every file it is handed.
+
+    from markdown.batch import convert_batch
+    convert_batch(['docs/'], output_dir='site/', jobs=4,
+                  extensions=['markdown.extensions.extra'])
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+from timeit import default_timer
+import multiprocessing
+import os
+from . import Markdown
+
+# File extensions picked up when a directory is given.
+MARKDOWN_EXTENSIONS = ('.md', '.markdown', '.mdown', '.mkdn', '.mkd')
+
+# The Markdown instance of the current worker process.
+_md = None
+_encoding = None
+
+
+def find_files(inputs, output_dir=None):
+    """
+    Return a list of `(source, destination)` paths for the given inputs.
+
+    Inputs may be files or directories, which are searched recursively for
+    Markdown files.  Destinations replace the file extension with `.html` and
+    are placed alongside the source, or under `output_dir`, mirroring the
+    layout below each input directory.
+
+    """
+    jobs = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext not in MARKDOWN_EXTENSIONS:
+                        continue
+                    source = os.path.join(root, name)
+                    relative = os.path.relpath(source, path)
+                    jobs.append(
+                        (source, _destination(source, relative, output_dir))
+                    )
+        else:
+            jobs.append(
+                (path, _destination(path, os.path.basename(path), output_dir))
+            )
+    return jobs
+
+
+def _destination(source, relative, output_dir):
+    """ Return the HTML path for `source`. """
+    if output_dir is None:
+        target = source
+    else:
+        target = os.path.join(output_dir, relative)
+    return os.path.splitext(target)[0] + '.html'
+
+
+def is_up_to_date(source, destination):
+    """ Return True if `destination` exists and is newer than `source`. """
+    try:
+        return os.path.getmtime(destination) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+def _init_worker(kwargs, encoding):
+    """ Build the Markdown instance of a worker process. """
+    global _md, _encoding
+    _md = Markdown(**kwargs)
+    _encoding = encoding
+
+
+def _convert(job):
+    """ Convert one file with the worker's Markdown instance. """
+    source, destination = job
+    start = default_timer()
+    folder = os.path.dirname(destination)
+    if folder and not os.path.isdir(folder):
+        try:
+            os.makedirs(folder)
+        except OSError:  # pragma: no cover
+            # Created by another worker in the meantime.
+            if not os.path.isdir(folder):
+                raise
+    _md.reset()
+    _md.convertFile(source, destination, _encoding)
+    return source, os.path.getsize(source), default_timer() - start
+
+
+def convert_batch(inputs, output_dir=None, jobs=1, force=False,
+                  encoding=None, stream=None, **kwargs):
+    """
+    Convert all Markdown files found in `inputs`.
+
+    Keyword arguments:
+
+    * inputs: A list of file and/or directory paths.
+    * output_dir: Directory to write the HTML files to. Defaults to writing
+      them alongside the sources.
+    * jobs: Number of worker processes. Defaults to 1 (no subprocesses).
+    * force: Convert even when the HTML file is newer than its source.
+    * encoding: Encoding of input and output files. Defaults to utf-8.
+    * stream: File object to write the per file times and the throughput
+      to. Nothing is written if `None`.
+    * Any arguments accepted by the Markdown class.
+
+    Returns: A dictionary with the number of `converted` and `skipped` files,
+    the number of `bytes` read and the elapsed `time`.
+
+    """
+    start = default_timer()
+    pending = []
+    skipped = 0
+    for source, destination in find_files(inputs, output_dir):
+        if not force and is_up_to_date(source, destination):
+            skipped += 1
+        else:
+            pending.append((source, destination))
+
+    if jobs > 1 and len(pending) > 1:
+        pool = multiprocessing.Pool(
+            min(jobs, len(pending)), _init_worker, (kwargs, encoding)
+        )
+        try:
+            results = pool.imap_unordered(_convert, pending)
+            total_bytes = _report(results, stream)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _init_worker(kwargs, encoding)
+        total_bytes = _report((_convert(job) for job in pending), stream)
+
+    elapsed = default_timer() - start
+    if stream is not None:
+        stream.write(
+            'Converted %d file(s), skipped %d, in %.3fs '
+            '(%.1f files/s, %.1f KiB/s)\n' % (
+                len(pending), skipped, elapsed,
+                len(pending) / elapsed if elapsed else 0.0,
+                total_bytes / 1024 / elapsed if elapsed else 0.0
+            )
+        )
+    return {
+        'converted': len(pending),
+        'skipped': skipped,
+        'bytes': total_bytes,
+        'time': elapsed
+    }
+
+
+def _report(results, stream):
+    """ Write the time of each converted file and return the bytes read. """
+    total_bytes = 0
+    for source, size, elapsed in results:
+        total_bytes += size
+        if stream is not None:
+            stream.write('%.3fs %s\n' % (elapsed, source))
+    return total_bytes
+
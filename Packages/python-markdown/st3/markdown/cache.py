@@ -0,0 +1,240 @@
+"""
+CONVERSION CACHE
+=============================================================================
+
+An opt-in, content-addressed cache of `Markdown.convert` results.
+
+Entries are keyed by a hash of the source text plus a fingerprint of the
+Markdown options, the loaded extensions and their configs, so one cache can be
+shared by many short-lived Markdown instances:
+
+    cache = markdown.cache.ConversionCache(max_entries=512)
+    html = markdown.markdown(text, extensions=[...], cache=cache)
+
+Side outputs that are attached to the Markdown instance (`Meta`, `toc`) or to
+an extension (those listed in its `cache_attributes`) are captured along with
+the HTML and restored on a hit, so a hit skips parsing entirely.
+
+`LRUCache` is the thread safe, bounded mapping behind it.  Extensions that
+keep their own caches across conversions (`codehilite`, for instance) use it
+as well.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+from collections import OrderedDict
+from copy import deepcopy
+import hashlib
+import sys
+import threading
+
+
+class LRUCache(object):
+    """
+    Thread safe mapping that drops the least recently used entries.
+
+    Keyword arguments:
+
+    * max_entries: Maximum number of entries, or `None` for no limit.
+    * max_bytes: Maximum total size of the entries, or `None` for no limit.
+      Sizes are given when storing an entry.
+
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_ratio(self):
+        """ Ratio of lookups that were served from the cache. """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def get(self, key, default=None, check=None):
+        """
+        Return the value of `key`, or `default` if there is none.
+
+        If `check` is given, it is called with the value, and a value it
+        rejects is dropped and counted as a miss.
+
+        """
+        with self.lock:
+            try:
+                value = self.entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if check is not None and not check(value):
+                self.size -= self.sizes.pop(key)
+                self.misses += 1
+                return default
+            # Mark as most recently used.
+            self.entries[key] = value
+            self.hits += 1
+            return value
+
+    def store(self, key, value, size=0):
+        """ Store `value` under `key`, evicting old entries as needed. """
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                del self.entries[key]
+                self.size -= self.sizes.pop(key)
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.size += size
+            while self.entries and (
+                (
+                    self.max_entries is not None and
+                    len(self.entries) > self.max_entries
+                ) or (
+                    self.max_bytes is not None and self.size > self.max_bytes
+                )
+            ):
+                old_key = self.entries.popitem(last=False)[0]
+                self.size -= self.sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        """ Drop all entries. Counters are kept. """
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.size = 0
+
+    def stats(self):
+        """ Return the cache counters as a dictionary. """
+        return {
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hit_ratio
+        }
+
+
+class CacheEntry(object):
+    """ A cached conversion result. """
+
+    def __init__(self, html, md_state, ext_state, size):
+        self.html = html
+        self.md_state = md_state
+        self.ext_state = ext_state
+        self.size = size
+
+
+class ConversionCache(object):
+    """
+    LRU cache of converted documents.
+
+    Keyword arguments:
+
+    * max_entries: Maximum number of cached documents.
+    * max_bytes: Maximum approximate memory used by the cached documents.
+
+    """
+
+    # Side outputs that extensions attach to the Markdown instance.
+    md_attributes = ('Meta', 'toc')
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024):
+        self.entries = LRUCache(max_entries, max_bytes)
+
+    @property
+    def hit_ratio(self):
+        """ Ratio of lookups that were served from the cache. """
+        return self.entries.hit_ratio
+
+    def get_key(self, md, source):
+        """ Return the cache key for converting `source` with `md`. """
+        return (
+            hashlib.sha1(source.encode('utf-8')).hexdigest(),
+            fingerprint(md)
+        )
+
+    def get(self, key):
+        """ Return the entry for `key` or `None`, updating the counters. """
+        return self.entries.get(key)
+
+    def store(self, key, md, html):
+        """ Capture the result of a conversion by `md` under `key`. """
+        md_state = {}
+        for name in self.md_attributes:
+            if hasattr(md, name):
+                md_state[name] = deepcopy(getattr(md, name))
+        ext_state = []
+        for index, ext in enumerate(_extensions(md)):
+            names = getattr(ext, 'cache_attributes', ())
+            if names:
+                ext_state.append((index, dict(
+                    (name, deepcopy(getattr(ext, name))) for name in names
+                )))
+        size = sys.getsizeof(html) + sum(
+            sys.getsizeof(value) for value in md_state.values()
+        ) + sum(
+            sys.getsizeof(value)
+            for index, state in ext_state for value in state.values()
+        )
+        self.entries.store(
+            key, CacheEntry(html, md_state, ext_state, size), size
+        )
+
+    def restore(self, md, entry):
+        """ Restore the side outputs of `entry` on `md`. """
+        for name, value in entry.md_state.items():
+            setattr(md, name, deepcopy(value))
+        # Equal fingerprints mean the same extensions in the same order.
+        extensions = _extensions(md)
+        for index, state in entry.ext_state:
+            for name, value in state.items():
+                setattr(extensions[index], name, deepcopy(value))
+
+    def clear(self):
+        """ Drop all entries. Counters are kept. """
+        self.entries.clear()
+
+    def stats(self):
+        """ Return the cache counters as a dictionary. """
+        return self.entries.stats()
+
+
+def _extensions(md):
+    """ Return the unique extensions loaded or registered on `md`. """
+    extensions = []
+    for ext in md.loadedExtensions + md.registeredExtensions:
+        if ext not in extensions:
+            extensions.append(ext)
+    return extensions
+
+
+def fingerprint(md):
+    """ Return a fingerprint of everything in `md` that affects the output. """
+    parts = [
+        md.output_format, md.tab_length, md.enable_attributes,
+        md.smart_emphasis, md.lazy_ol, md.safeMode, md.html_replacement_text,
+        md.__class__.__module__, md.__class__.__name__
+    ]
+    for ext in _extensions(md):
+        try:
+            parts.append(ext.getCacheKey())
+        except Exception:
+            # Extensions which do not follow the config conventions.
+            parts.append((
+                ext.__class__.__module__, ext.__class__.__name__,
+                repr(getattr(ext, 'config', None))
+            ))
+    return repr(parts)
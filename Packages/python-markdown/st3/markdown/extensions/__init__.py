@@ -20,6 +20,10 @@ class Extension(object):
     # if a default is not set here.
     config = {}
 
+    # Names of attributes which hold per document state. They are captured
+    # and restored by `markdown.cache.ConversionCache`.
+    cache_attributes = ()
+
     def __init__(self, *args, **kwargs):
         """ Initiate Extension and set up configs. """
 
@@ -61,6 +65,12 @@ class Extension(object):
         """ Return all configs settings as a dict. """
         return dict([(key, self.getConfig(key)) for key in self.config.keys()])
 
+    def getCacheKey(self):
+        """ Return a fingerprint of the settings that affect the output. """
+        configs = sorted(self.getConfigs().items())
+        return (self.__class__.__module__, self.__class__.__name__,
+                repr(configs))
+
     def getConfigInfo(self):
         """ Return all config descriptions as a list of tuples. """
         return [(key, self.config[key][1]) for key in self.config.keys()]
@@ -26,6 +26,7 @@ import re
 
 # Global Vars
 ABBR_REF_RE = re.compile(r'[*]\[(?P<abbr>[^\]]*)\][ ]?:\s*(?P<title>.*)')
+NO_MATCH_RE = r'(?!)'
 
 
 class AbbrExtension(Extension):
@@ -33,31 +34,53 @@ class AbbrExtension(Extension):
 
     def extendMarkdown(self, md, md_globals):
         """ Insert AbbrPreprocessor before ReferencePreprocessor. """
-        md.preprocessors.add('abbr', AbbrPreprocessor(md), '<reference')
+        md.registerExtension(self)
+        self.md = md
+        self.pattern = AbbrGlossaryPattern()
+        md.preprocessors.add(
+            'abbr', AbbrPreprocessor(md, self.pattern), '<reference'
+        )
+
+    def reset(self):
+        """ Forget the abbreviations of the previous document. """
+        self.pattern.set_abbrs({})
+        if 'abbr' in self.md.inlinePatterns:
+            del self.md.inlinePatterns['abbr']
 
 
 class AbbrPreprocessor(Preprocessor):
     """ Abbreviation Preprocessor - parse text for abbr references. """
 
+    def __init__(self, md, pattern=None):
+        super(AbbrPreprocessor, self).__init__(md)
+        self.pattern = pattern or AbbrGlossaryPattern()
+
     def run(self, lines):
         '''
         Find and remove all Abbreviation references from the text.
-        Each reference is set as a new AbbrPattern in the markdown instance.
+        All references are matched by a single AbbrGlossaryPattern which is
+        added to the markdown instance once the first one is found.
 
         '''
         new_text = []
+        abbrs = {}
         for line in lines:
             m = ABBR_REF_RE.match(line)
             if m:
                 abbr = m.group('abbr').strip()
-                title = m.group('title').strip()
-                self.markdown.inlinePatterns['abbr-%s' % abbr] = \
-                    AbbrPattern(self._generate_pattern(abbr), title)
+                if abbr:
+                    abbrs[abbr] = m.group('title').strip()
                 # Preserve the line to prevent raw HTML indexing issue.
                 # https://github.com/Python-Markdown/markdown/issues/584
                 new_text.append('')
             else:
                 new_text.append(line)
+        if abbrs:
+            glossary = dict(self.pattern.abbrs)
+            glossary.update(abbrs)
+            self.pattern.set_abbrs(glossary)
+            if 'abbr' not in self.markdown.inlinePatterns:
+                self.markdown.inlinePatterns['abbr'] = self.pattern
         return new_text
 
     def _generate_pattern(self, text):
@@ -90,5 +113,68 @@ class AbbrPattern(Pattern):
         return abbr
 
 
+class AbbrGlossaryPattern(Pattern):
+    """
+    Inline pattern matching every abbreviation of a document at once.
+
+    The abbreviations are compiled into one regular expression shaped like a
+    trie (`HTML` and `HTTP` become `H(?:T(?:ML|TP))`), so a text node is
+    scanned once no matter how many abbreviations are defined.  At a given
+    position the longest abbreviation wins.
+
+    """
+
+    def __init__(self, abbrs=None):
+        super(AbbrGlossaryPattern, self).__init__(NO_MATCH_RE)
+        self._key = []
+        self.set_abbrs(abbrs or {})
+
+    def set_abbrs(self, abbrs):
+        """ Set the `{abbreviation: title}` dict and rebuild the regex. """
+        self.abbrs = abbrs
+        if not abbrs:
+            # Nothing can match; keep the regex for the next document which
+            # likely defines the same abbreviations.
+            return
+        key = sorted(abbrs)
+        if key != self._key:
+            self._key = key
+            self.pattern = r'(?P<abbr>\b%s\b)' % self._build_trie(key)
+            self.compiled_re = re.compile(r"^(.*?)%s(.*)$" % self.pattern,
+                                          re.DOTALL | re.UNICODE)
+
+    def _build_trie(self, abbrs):
+        """ Return a regex matching any of the `abbrs` strings. """
+        trie = {}
+        for abbr in abbrs:
+            node = trie
+            for char in abbr:
+                node = node.setdefault(char, {})
+            node[''] = None
+        return self._trie_to_pattern(trie)
+
+    def _trie_to_pattern(self, node):
+        """ Return the regex for the branches below a trie `node`. """
+        alternatives = [
+            re.escape(char) + self._trie_to_pattern(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and '' not in node:
+            return alternatives[0]
+        pattern = '(?:%s)' % '|'.join(alternatives)
+        if '' in node:
+            # An abbreviation ends here; prefer the longer ones.
+            pattern += '?'
+        return pattern
+
+    def handleMatch(self, m):
+        abbr = etree.Element('abbr')
+        abbr.text = AtomicString(m.group('abbr'))
+        abbr.set('title', self.abbrs[m.group('abbr')])
+        return abbr
+
+
 def makeExtension(*args, **kwargs):
     return AbbrExtension(*args, **kwargs)
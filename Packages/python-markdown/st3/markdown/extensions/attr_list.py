@@ -24,47 +24,40 @@ from ..treeprocessors import Treeprocessor
 from ..util import isBlockLevel
 import re
 
-try:
-    Scanner = re.Scanner
-except AttributeError:  # pragma: no cover
-    # must be on Python 2.4
-    from sre import Scanner
-
-
-def _handle_double_quote(s, t):
-    k, v = t.split('=', 1)
-    return k, v.strip('"')
-
-
-def _handle_single_quote(s, t):
-    k, v = t.split('=', 1)
-    return k, v.strip("'")
-
-
-def _handle_key_value(s, t):
-    return t.split('=', 1)
-
-
-def _handle_word(s, t):
-    if t.startswith('.'):
-        return '.', t[1:]
-    if t.startswith('#'):
-        return 'id', t[1:]
-    return t, t
-
-
-_scanner = Scanner([
-    (r'[^ =]+=".*?"', _handle_double_quote),
-    (r"[^ =]+='.*?'", _handle_single_quote),
-    (r'[^ =]+=[^ =]+', _handle_key_value),
-    (r'[^ =]+', _handle_word),
-    (r' ', None)
-])
+# A `key="value"`, `key='value'` or `key=value` pair, a single word or a space.
+# The alternatives are tried in that order at each position and parsing
+# stops at the first position where none of them match.
+_ATTR_RE = re.compile(
+    r'''([^ =]+)=(?:"(.*?)"|'(.*?)'|([^ =]+))|([^ =]+)|[ ]'''
+)
 
 
 def get_attrs(str):
     """ Parse attribute list and return a list of attribute tuples. """
-    return _scanner.scan(str)[0]
+    attrs = []
+    match = _ATTR_RE.match
+    pos = 0
+    end = len(str)
+    while pos < end:
+        m = match(str, pos)
+        if m is None:
+            break
+        pos = m.end()
+        key, dq, sq, value, word = m.groups()
+        if key is not None:
+            if dq is not None:
+                value = dq
+            elif sq is not None:
+                value = sq
+            attrs.append((key, value))
+        elif word is not None:
+            if word.startswith('.'):
+                attrs.append(('.', word[1:]))
+            elif word.startswith('#'):
+                attrs.append(('id', word[1:]))
+            else:
+                attrs.append((word, word))
+    return attrs
 
 
 def isheader(elem):
@@ -77,12 +70,21 @@ class AttrListTreeprocessor(Treeprocessor):
     HEADER_RE = re.compile(r'[ ]+%s[ ]*$' % BASE_RE)
     BLOCK_RE = re.compile(r'\n[ ]*%s[ ]*$' % BASE_RE)
     INLINE_RE = re.compile(r'^%s' % BASE_RE)
+    CELL_RE = re.compile(BASE_RE)
     NAME_RE = re.compile(r'[^A-Z_a-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u02ff'
                          r'\u0370-\u037d\u037f-\u1fff\u200c-\u200d'
                          r'\u2070-\u218f\u2c00-\u2fef\u3001-\ud7ff'
                          r'\uf900-\ufdcf\ufdf0-\ufffd'
                          r'\:\-\.0-9\u00b7\u0300-\u036f\u203f-\u2040]+')
 
+    # Number of parsed attribute lists to keep.
+    MAX_CACHED = 512
+
+    def __init__(self, *args, **kwargs):
+        super(AttrListTreeprocessor, self).__init__(*args, **kwargs)
+        # Attribute list string => parsed and sanitized attributes.
+        self.parsed = {}
+
     def run(self, doc):
         for elem in doc.iter():
             if isBlockLevel(elem.tag):
@@ -101,25 +103,26 @@ class AttrListTreeprocessor(Treeprocessor):
                             break
                     if pos is None and elem[-1].tail:
                         # use tail of last child. no ul or ol.
-                        m = RE.search(elem[-1].tail)
+                        m = '{' in elem[-1].tail and RE.search(elem[-1].tail)
                         if m:
                             self.assign_attrs(elem, m.group(1))
                             elem[-1].tail = elem[-1].tail[:m.start()]
                     elif pos is not None and pos > 0 and elem[pos-1].tail:
                         # use tail of last child before ul or ol
-                        m = RE.search(elem[pos-1].tail)
+                        tail = elem[pos-1].tail
+                        m = '{' in tail and RE.search(tail)
                         if m:
                             self.assign_attrs(elem, m.group(1))
                             elem[pos-1].tail = elem[pos-1].tail[:m.start()]
                     elif elem.text:
                         # use text. ul is first child.
-                        m = RE.search(elem.text)
+                        m = '{' in elem.text and RE.search(elem.text)
                         if m:
                             self.assign_attrs(elem, m.group(1))
                             elem.text = elem.text[:m.start()]
                 elif len(elem) and elem[-1].tail:
                     # has children. Get from tail of last child
-                    m = RE.search(elem[-1].tail)
+                    m = '{' in elem[-1].tail and RE.search(elem[-1].tail)
                     if m:
                         self.assign_attrs(elem, m.group(1))
                         elem[-1].tail = elem[-1].tail[:m.start()]
@@ -128,9 +131,9 @@ class AttrListTreeprocessor(Treeprocessor):
                             elem[-1].tail = elem[-1].tail.rstrip('#').rstrip()
                 elif elem.text:
                     # no children. Get from text.
-                    m = RE.search(elem.text)
-                    if not m and elem.tag == 'td':
-                        m = re.search(self.BASE_RE, elem.text)
+                    m = '{' in elem.text and RE.search(elem.text)
+                    if not m and elem.tag == 'td' and '{' in elem.text:
+                        m = self.CELL_RE.search(elem.text)
                     if m:
                         self.assign_attrs(elem, m.group(1))
                         elem.text = elem.text[:m.start()]
@@ -139,7 +142,7 @@ class AttrListTreeprocessor(Treeprocessor):
                             elem.text = elem.text.rstrip('#').rstrip()
             else:
                 # inline: check for attrs at start of tail
-                if elem.tail:
+                if elem.tail and elem.tail.startswith('{'):
                     m = self.INLINE_RE.match(elem.tail)
                     if m:
                         self.assign_attrs(elem, m.group(1))
@@ -147,7 +150,16 @@ class AttrListTreeprocessor(Treeprocessor):
 
     def assign_attrs(self, elem, attrs):
         """ Assign attrs to element. """
-        for k, v in get_attrs(attrs):
+        parsed = self.parsed.get(attrs)
+        if parsed is None:
+            parsed = tuple(
+                (k if k == '.' else self.sanitize_name(k), v)
+                for k, v in get_attrs(attrs)
+            )
+            if len(self.parsed) >= self.MAX_CACHED:
+                self.parsed.clear()
+            self.parsed[attrs] = parsed
+        for k, v in parsed:
             if k == '.':
                 # add to class
                 cls = elem.get('class')
@@ -157,7 +169,7 @@ class AttrListTreeprocessor(Treeprocessor):
                     elem.set('class', v)
             else:
                 # assign attr k with v
-                elem.set(self.sanitize_name(k), v)
+                elem.set(k, v)
 
     def sanitize_name(self, name):
         """
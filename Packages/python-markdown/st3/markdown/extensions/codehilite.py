@@ -19,6 +19,8 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from . import Extension
 from ..treeprocessors import Treeprocessor
+from ..cache import LRUCache
+import hashlib
 
 try:
     from pygments import highlight
@@ -28,6 +30,45 @@ try:
 except ImportError:
     pygments = False
 
+# Highlighted code by source and options, shared by all instances so that
+# unchanged blocks are not highlighted again on the next conversion.
+CACHE_SIZE = 512
+_cache = LRUCache(CACHE_SIZE)
+
+# Lexers by name and formatters by options, reused for every block.
+MAX_SHARED = 128
+_lexers = LRUCache(MAX_SHARED)
+_formatters = LRUCache(MAX_SHARED)
+
+_MISSING = object()
+
+
+def _get_lexer(name):
+    """ Return the shared lexer for a language name or None if unknown. """
+    lexer = _lexers.get(name, _MISSING)
+    if lexer is _MISSING:
+        try:
+            lexer = get_lexer_by_name(name)
+        except ValueError:
+            lexer = None
+        _lexers.store(name, lexer)
+    return lexer
+
+
+def _get_formatter(linenos, cssclass, style, noclasses, hl_lines):
+    """ Return the shared html formatter for the given options. """
+    key = (linenos, cssclass, style, noclasses, tuple(hl_lines))
+    formatter = _formatters.get(key)
+    if formatter is None:
+        formatter = get_formatter_by_name('html',
+                                          linenos=linenos,
+                                          cssclass=cssclass,
+                                          style=style,
+                                          noclasses=noclasses,
+                                          hl_lines=hl_lines)
+        _formatters.store(key, formatter)
+    return formatter
+
 
 def parse_hl_lines(expr):
     """Support our syntax for emphasizing certain lines of code.
@@ -104,23 +145,28 @@ class CodeHilite(object):
             self._parseHeader()
 
         if pygments and self.use_pygments:
-            try:
-                lexer = get_lexer_by_name(self.lang)
-            except ValueError:
-                try:
-                    if self.guess_lang:
-                        lexer = guess_lexer(self.src)
-                    else:
-                        lexer = get_lexer_by_name('text')
-                except ValueError:
-                    lexer = get_lexer_by_name('text')
-            formatter = get_formatter_by_name('html',
-                                              linenos=self.linenums,
-                                              cssclass=self.css_class,
-                                              style=self.style,
-                                              noclasses=self.noclasses,
-                                              hl_lines=self.hl_lines)
-            return highlight(self.src, lexer, formatter)
+            key = (
+                hashlib.sha1(self.src.encode('utf-8')).digest(), self.lang,
+                self.guess_lang, self.linenums, self.css_class, self.style,
+                self.noclasses, tuple(self.hl_lines)
+            )
+            html = _cache.get(key)
+            if html is None:
+                lexer = _get_lexer(self.lang)
+                if lexer is None:
+                    try:
+                        if self.guess_lang:
+                            lexer = guess_lexer(self.src)
+                        else:
+                            lexer = _get_lexer('text')
+                    except ValueError:
+                        lexer = _get_lexer('text')
+                formatter = _get_formatter(self.linenums, self.css_class,
+                                           self.style, self.noclasses,
+                                           self.hl_lines)
+                html = highlight(self.src, lexer, formatter)
+                _cache.store(key, html)
+            return html
         else:
             # just escape and build markup usable by JS highlighting libs
             txt = self.src.replace('&', '&amp;')
@@ -202,27 +248,29 @@ class HiliteTreeprocessor(Treeprocessor):
 
     def run(self, root):
         """ Find code blocks and store in htmlStash. """
-        blocks = root.iter('pre')
+        blocks = [
+            block for block in root.iter('pre')
+            if len(block) == 1 and block[0].tag == 'code'
+        ]
         for block in blocks:
-            if len(block) == 1 and block[0].tag == 'code':
-                code = CodeHilite(
-                    block[0].text,
-                    linenums=self.config['linenums'],
-                    guess_lang=self.config['guess_lang'],
-                    css_class=self.config['css_class'],
-                    style=self.config['pygments_style'],
-                    noclasses=self.config['noclasses'],
-                    tab_length=self.markdown.tab_length,
-                    use_pygments=self.config['use_pygments']
-                )
-                placeholder = self.markdown.htmlStash.store(code.hilite(),
-                                                            safe=True)
-                # Clear codeblock in etree instance
-                block.clear()
-                # Change to p element which will later
-                # be removed when inserting raw html
-                block.tag = 'p'
-                block.text = placeholder
+            code = CodeHilite(
+                block[0].text,
+                linenums=self.config['linenums'],
+                guess_lang=self.config['guess_lang'],
+                css_class=self.config['css_class'],
+                style=self.config['pygments_style'],
+                noclasses=self.config['noclasses'],
+                tab_length=self.markdown.tab_length,
+                use_pygments=self.config['use_pygments']
+            )
+            placeholder = self.markdown.htmlStash.store(code.hilite(),
+                                                        safe=True)
+            # Clear codeblock in etree instance
+            block.clear()
+            # Change to p element which will later
+            # be removed when inserting raw html
+            block.tag = 'p'
+            block.text = placeholder
 
 
 class CodeHiliteExtension(Extension):
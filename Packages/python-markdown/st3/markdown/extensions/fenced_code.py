@@ -65,40 +65,59 @@ class FencedBlockPreprocessor(Preprocessor):
             self.checked_for_codehilite = True
 
         text = "\n".join(lines)
+        # Find all the blocks in one pass.  A placeholder never contains a
+        # fence, so searching on from the end of a block finds the same
+        # blocks as searching the text again once the block is replaced.
+        blocks = []
+        pos = 0
         while 1:
-            m = self.FENCED_BLOCK_RE.search(text)
+            m = self.FENCED_BLOCK_RE.search(text, pos)
             if m:
-                lang = ''
-                if m.group('lang'):
-                    lang = self.LANG_TAG % m.group('lang')
-
-                # If config is not empty, then the codehighlite extension
-                # is enabled, so we call it to highlight the code
-                if self.codehilite_conf:
-                    highliter = CodeHilite(
-                        m.group('code'),
-                        linenums=self.codehilite_conf['linenums'][0],
-                        guess_lang=self.codehilite_conf['guess_lang'][0],
-                        css_class=self.codehilite_conf['css_class'][0],
-                        style=self.codehilite_conf['pygments_style'][0],
-                        use_pygments=self.codehilite_conf['use_pygments'][0],
-                        lang=(m.group('lang') or None),
-                        noclasses=self.codehilite_conf['noclasses'][0],
-                        hl_lines=parse_hl_lines(m.group('hl_lines'))
-                    )
-
-                    code = highliter.hilite()
-                else:
-                    code = self.CODE_WRAP % (lang,
-                                             self._escape(m.group('code')))
-
-                placeholder = self.markdown.htmlStash.store(code, safe=True)
-                text = '%s\n%s\n%s' % (text[:m.start()],
-                                       placeholder,
-                                       text[m.end():])
+                blocks.append(m)
+                pos = m.end()
             else:
                 break
-        return text.split("\n")
+        if not blocks:
+            return lines
+
+        parts = []
+        pos = 0
+        for m, code in zip(blocks, self.highlight(blocks)):
+            placeholder = self.markdown.htmlStash.store(code, safe=True)
+            parts.extend((text[pos:m.start()], '\n', placeholder, '\n'))
+            pos = m.end()
+        parts.append(text[pos:])
+        return ''.join(parts).split("\n")
+
+    def highlight(self, blocks):
+        """ Return the html of each of the matched blocks. """
+        results = []
+        for m in blocks:
+            lang = ''
+            if m.group('lang'):
+                lang = self.LANG_TAG % m.group('lang')
+
+            # If config is not empty, then the codehighlite extension
+            # is enabled, so we call it to highlight the code
+            if self.codehilite_conf:
+                highliter = CodeHilite(
+                    m.group('code'),
+                    linenums=self.codehilite_conf['linenums'][0],
+                    guess_lang=self.codehilite_conf['guess_lang'][0],
+                    css_class=self.codehilite_conf['css_class'][0],
+                    style=self.codehilite_conf['pygments_style'][0],
+                    use_pygments=self.codehilite_conf['use_pygments'][0],
+                    lang=(m.group('lang') or None),
+                    noclasses=self.codehilite_conf['noclasses'][0],
+                    hl_lines=parse_hl_lines(m.group('hl_lines'))
+                )
+
+                code = highliter.hilite()
+            else:
+                code = self.CODE_WRAP % (lang,
+                                         self._escape(m.group('code')))
+            results.append(code)
+        return results
 
     def _escape(self, txt):
         """ basic html escaping """
@@ -35,6 +35,8 @@ RE_REF_ID = re.compile(r'(fnref)(\d+)')
 class FootnoteExtension(Extension):
     """ Footnote Extension. """
 
+    cache_attributes = ('footnotes', 'ordinals', 'found_refs', 'used_refs')
+
     def __init__(self, *args, **kwargs):
         """ Setup configs. """
 
@@ -99,9 +101,18 @@ class FootnoteExtension(Extension):
             "footnote", FootnotePostprocessor(self), ">amp_substitute"
         )
 
+    def getCacheKey(self):
+        """ Unique ids depend on the number of resets. """
+        key = super(FootnoteExtension, self).getCacheKey()
+        if self.getConfig("UNIQUE_IDS"):
+            key += (self.unique_prefix,)
+        return key
+
     def reset(self):
         """ Clear footnotes on reset, and prepare for distinct document. """
         self.footnotes = OrderedDict()
+        # Footnote id => number of the footnote.
+        self.ordinals = {}
         self.unique_prefix += 1
         self.found_refs = {}
         self.used_refs = set()
@@ -129,13 +140,15 @@ class FootnoteExtension(Extension):
 
     def findFootnotesPlaceholder(self, root):
         """ Return ElementTree Element that contains Footnote placeholder. """
+        marker = self.getConfig("PLACE_MARKER")
+
         def finder(element):
             for child in element:
                 if child.text:
-                    if child.text.find(self.getConfig("PLACE_MARKER")) > -1:
+                    if child.text.find(marker) > -1:
                         return child, element, True
                 if child.tail:
-                    if child.tail.find(self.getConfig("PLACE_MARKER")) > -1:
+                    if child.tail.find(marker) > -1:
                         return child, element, False
                 child_res = finder(child)
                 if child_res is not None:
@@ -147,6 +160,8 @@ class FootnoteExtension(Extension):
 
     def setFootnote(self, id, text):
         """ Store a footnote for later retrieval. """
+        if id not in self.ordinals:
+            self.ordinals[id] = len(self.ordinals) + 1
         self.footnotes[id] = text
 
     def get_separator(self):
@@ -171,7 +186,7 @@ class FootnoteExtension(Extension):
     def makeFootnotesDiv(self, root):
         """ Return div of footnotes as et Element. """
 
-        if not list(self.footnotes.keys()):
+        if not self.footnotes:
             return None
 
         div = util.etree.Element("div")
@@ -179,27 +194,25 @@ class FootnoteExtension(Extension):
         util.etree.SubElement(div, "hr")
         ol = util.etree.SubElement(div, "ol")
         surrogate_parent = util.etree.Element("div")
+        html5 = self.md.output_format in ['html5', 'xhtml5']
+        title = self.getConfig("BACKLINK_TITLE")
 
-        for id in self.footnotes.keys():
+        for id in self.footnotes:
             li = util.etree.SubElement(ol, "li")
             li.set("id", self.makeFootnoteId(id))
             # Parse footnote with surrogate parent as li cannot be used.
             # List block handlers have special logic to deal with li.
             # When we are done parsing, we will copy everything over to li.
             self.parser.parseChunk(surrogate_parent, self.footnotes[id])
-            for el in list(surrogate_parent):
+            for el in surrogate_parent:
                 li.append(el)
-                surrogate_parent.remove(el)
+            del surrogate_parent[:]
             backlink = util.etree.Element("a")
             backlink.set("href", "#" + self.makeFootnoteRefId(id))
-            if self.md.output_format not in ['html5', 'xhtml5']:
+            if not html5:
                 backlink.set("rev", "footnote")  # Invalid in HTML5
             backlink.set("class", "footnote-backref")
-            backlink.set(
-                "title",
-                self.getConfig("BACKLINK_TITLE") %
-                (self.footnotes.index(id)+1)
-            )
+            backlink.set("title", title % self.ordinals[id])
             backlink.text = FN_BACKLINK_TEXT
 
             if len(li):
@@ -235,7 +248,7 @@ class FootnotePreprocessor(Preprocessor):
         while True:
             m = DEF_RE.match(lines[i])
             if m:
-                fn, _i = self.detectTabbed(lines[i+1:])
+                fn, _i = self.detectTabbed(lines, i+1)
                 fn.insert(0, m.group(2))
                 i += _i-1  # skip past footnote
                 footnote = "\n".join(fn)
@@ -252,14 +265,16 @@ class FootnotePreprocessor(Preprocessor):
                 break
         return newlines
 
-    def detectTabbed(self, lines):
+    def detectTabbed(self, lines, start=0):
         """ Find indented text and remove indent before further proccesing.
 
         Keyword arguments:
 
         * lines: an array of strings
+        * start: the index of the line to start at
 
-        Returns: a list of post processed items and the index of last line.
+        Returns: a list of post processed items and the index of last line,
+        relative to start.
 
         """
         items = []
@@ -271,7 +286,8 @@ class FootnotePreprocessor(Preprocessor):
             if match:
                 return match.group(4)
 
-        for line in lines:
+        for index in range(start, len(lines)):
+            line = lines[index]
             if line.strip():  # Non-blank line
                 detabbed_line = detab(line)
                 if detabbed_line:
@@ -291,7 +307,7 @@ class FootnotePreprocessor(Preprocessor):
                 i += 1  # advance
 
                 # Find the next non-blank line
-                for j in range(i, len(lines)):
+                for j in range(start + i, len(lines)):
                     if lines[j].strip():
                         next_line = lines[j]
                         break
@@ -324,7 +340,7 @@ class FootnotePattern(Pattern):
 
     def handleMatch(self, m):
         id = m.group(2)
-        if id in self.footnotes.footnotes.keys():
+        if id in self.footnotes.footnotes:
             sup = util.etree.Element("sup")
             a = util.etree.SubElement(sup, "a")
             sup.set('id', self.footnotes.makeFootnoteRefId(id, found=True))
@@ -332,7 +348,7 @@ class FootnotePattern(Pattern):
             if self.footnotes.md.output_format not in ['html5', 'xhtml5']:
                 a.set('rel', 'footnote')  # invalid in HTML5
             a.set('class', 'footnote-ref')
-            a.text = util.text_type(self.footnotes.footnotes.index(id) + 1)
+            a.text = util.text_type(self.footnotes.ordinals[id])
             return sup
         else:
             return None
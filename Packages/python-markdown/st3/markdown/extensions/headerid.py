@@ -20,14 +20,14 @@ from __future__ import unicode_literals
 from . import Extension
 from ..treeprocessors import Treeprocessor
 from ..util import parseBoolValue
-from .toc import slugify, unique, stashedHTML2text
+from .toc import slugify, stashedHTML2text, UniqueIds
 import warnings
 
 
 class HeaderIdTreeprocessor(Treeprocessor):
     """ Assign IDs to headers. """
 
-    IDs = set()
+    IDs = UniqueIds()
 
     def run(self, doc):
         start_level, force_id = self._get_meta()
@@ -41,7 +41,7 @@ class HeaderIdTreeprocessor(Treeprocessor):
                     else:
                         id = stashedHTML2text(''.join(elem.itertext()), self.md)
                         id = slugify(id, sep)
-                    elem.set('id', unique(id, self.IDs))
+                    elem.set('id', self.IDs.unique(id))
                 if start_level:
                     level = int(elem.tag[-1]) + start_level
                     if level > 6:
@@ -90,7 +90,7 @@ class HeaderIdExtension(Extension):
             md.treeprocessors.add('headerid', self.processor, '>prettify')
 
     def reset(self):
-        self.processor.IDs = set()
+        self.processor.IDs = UniqueIds()
 
 
 def makeExtension(*args, **kwargs):
@@ -19,8 +19,15 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from . import Extension
 from ..preprocessors import Preprocessor
+from .. import util
+from collections import OrderedDict
+import itertools
 import re
 import logging
+try:  # pragma: no cover
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
 
 log = logging.getLogger('MARKDOWN')
 
@@ -31,29 +38,79 @@ BEGIN_RE = re.compile(r'^-{3}(\s.*)?')
 END_RE = re.compile(r'^(-{3}|\.{3})(\s.*)?')
 
 
+if yaml is not None:  # pragma: no cover
+    class YamlLoader(yaml.SafeLoader):
+        """ Load mappings as ordered dictionaries and strings as unicode. """
+
+    def _construct_mapping(loader, node):
+        loader.flatten_mapping(node)
+        return OrderedDict(loader.construct_pairs(node))
+
+    def _construct_str(loader, node):
+        return loader.construct_scalar(node)
+
+    YamlLoader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _construct_mapping
+    )
+    YamlLoader.add_constructor('tag:yaml.org,2002:str', _construct_str)
+
+
 class MetaExtension (Extension):
     """ Meta-Data extension for Python-Markdown. """
 
+    def __init__(self, *args, **kwargs):
+        self.config = {
+            'yaml': [False,
+                     'Read a front matter block between "---" lines as '
+                     'YAML. Requires PyYAML. - Default: False']
+        }
+        super(MetaExtension, self).__init__(*args, **kwargs)
+
     def extendMarkdown(self, md, md_globals):
         """ Add MetaPreprocessor to Markdown instance. """
         md.preprocessors.add("meta",
-                             MetaPreprocessor(md),
+                             MetaPreprocessor(md, self.getConfig('yaml')),
                              ">normalize_whitespace")
 
 
 class MetaPreprocessor(Preprocessor):
     """ Get Meta-Data. """
 
+    def __init__(self, md=None, use_yaml=False):
+        super(MetaPreprocessor, self).__init__(md)
+        self.use_yaml = use_yaml
+
     def run(self, lines):
         """ Parse Meta-Data and store in Markdown.Meta. """
+        meta, count = self.parse(lines)
+        self.markdown.Meta = meta
+        return lines[count:]
+
+    def parse(self, lines):
+        """
+        Parse the Meta-Data at the start of `lines`.
+
+        `lines` may be any iterable of normalized lines and is only consumed
+        up to the end of the Meta-Data.  Returns a `(meta, count)` tuple,
+        where `count` is the number of lines taken up by the Meta-Data.
+
+        """
+        lines = iter(lines)
+        if self.use_yaml and yaml is not None:
+            meta, count, lines = self.parse_yaml(lines)
+            if meta is not None:
+                return meta, count
+
         meta = {}
         key = None
-        if lines and BEGIN_RE.match(lines[0]):
-            lines.pop(0)
-        while lines:
-            line = lines.pop(0)
+        count = 0
+        for line in lines:
+            if count == 0 and BEGIN_RE.match(line):
+                count += 1
+                continue
             m1 = META_RE.match(line)
             if line.strip() == '' or END_RE.match(line):
+                count += 1
                 break  # blank line or end of YAML header - done
             if m1:
                 key = m1.group('key').lower().strip()
@@ -68,10 +125,49 @@ class MetaPreprocessor(Preprocessor):
                     # Add another line to existing key
                     meta[key].append(m2.group('value').strip())
                 else:
-                    lines.insert(0, line)
                     break  # no meta data - done
-        self.markdown.Meta = meta
-        return lines
+            count += 1
+        return meta, count
+
+    def parse_yaml(self, lines):
+        """
+        Parse a YAML front matter block at the start of `lines`.
+
+        Returns a `(meta, count, lines)` tuple.  If there is no front matter
+        or it does not hold a mapping, `meta` is `None` and `lines` yields
+        all of the given lines again.
+
+        """
+        block = []
+        for line in lines:
+            block.append(line)
+            if len(block) == 1:
+                if line != '---':
+                    break
+            elif len(block) == 2 and not line.strip():
+                break
+            elif line in ('---', '...'):
+                try:
+                    meta = yaml.load('\n'.join(block[1:-1]), YamlLoader)
+                except Exception:
+                    break
+                if meta is None:
+                    meta = OrderedDict()
+                if isinstance(meta, dict):
+                    return meta, len(block), lines
+                break
+        return None, 0, itertools.chain(block, lines)
+
+    def normalize(self, lines):
+        """
+        Yield `lines` as normalized by the "normalize_whitespace"
+        preprocessor, for reading Meta-Data before it has run.
+
+        """
+        tab_length = self.markdown.tab_length
+        for line in lines:
+            line = line.replace(util.STX, "").replace(util.ETX, "")
+            yield line.rstrip('\r\n').expandtabs(tab_length)
 
 
 def makeExtension(*args, **kwargs):
@@ -83,9 +83,11 @@ smartypants.py license:
 
 from __future__ import unicode_literals
 from . import Extension
-from ..inlinepatterns import HtmlPattern, HTML_RE
-from ..odict import OrderedDict
+from ..inlinepatterns import Pattern, HtmlPattern, HTML_RE
+from ..odict import Registry
 from ..treeprocessors import InlineProcessor
+from ..util import STX, ETX
+import re
 
 
 # Constants for quote education.
@@ -167,6 +169,88 @@ class SubstituteTextPattern(HtmlPattern):
         return result
 
 
+class SubstitutionsPattern(Pattern):
+    """
+    Apply a registry of `SubstituteTextPattern`s to a text in one go.
+
+    Registered as separate inline patterns, each substitution would take a
+    pass of the inline loop, which rebuilds the text for every match. Here
+    each one is a single regex search over the text instead. They still
+    run in registry order, and each sees the substitutions made before it as
+    placeholders, as the context rules for quotes rely on that.
+    """
+
+    PLACEHOLDER = STX + 's%d' + ETX
+    PLACEHOLDER_RE = re.compile(STX + r's(\d+)' + ETX)
+
+    def __init__(self, patterns, markdown_instance):
+        Pattern.__init__(self, r'(.+)')
+        self.markdown = markdown_instance
+        self.substitutions = [
+            (
+                re.compile(pattern.pattern, re.DOTALL | re.UNICODE),
+                pattern.replace
+            )
+            for pattern in patterns.values()
+        ]
+
+    def handleMatch(self, m):
+        text = m.group(2)
+        found = []
+        for regex, replace in self.substitutions:
+            text = self.substitute(regex, replace, text, found)
+        if not found:
+            return None
+
+        # Fill the html stash in the order of the matches, as separate
+        # inline patterns would.
+        results = []
+        for m, replace in found:
+            result = ''
+            for part in replace:
+                if isinstance(part, int):
+                    # Groups of the bare pattern are one lower than those
+                    # of the inline pattern.
+                    result += m.group(part - 1)
+                else:
+                    result += self.markdown.htmlStash.store(part, safe=True)
+            results.append(result)
+        return self.PLACEHOLDER_RE.sub(
+            lambda m: results[int(m.group(1))], text
+        )
+
+    def substitute(self, regex, replace, text, found):
+        """ Replace every match of regex in text with a placeholder. """
+        result = []
+        pos = 0
+        last = 0
+        placeholder = None
+        while True:
+            m = regex.search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            if placeholder is not None and start == last:
+                # The inline loop would see the placeholder of the previous
+                # match in front of this one, not the original text.
+                m = regex.match(placeholder + text[start:], len(placeholder))
+                if m is None:
+                    pos = start + 1
+                    continue
+                end = start + m.end() - len(placeholder)
+            else:
+                end = m.end()
+            placeholder = self.PLACEHOLDER % len(found)
+            found.append((m, replace))
+            result.append(text[last:start])
+            result.append(placeholder)
+            last = pos = end
+        if placeholder is None:
+            return text
+        result.append(text[last:])
+        return ''.join(result)
+
+
 class SmartyExtension(Extension):
     def __init__(self, *args, **kwargs):
         self.config = {
@@ -246,7 +330,7 @@ class SmartyExtension(Extension):
 
     def extendMarkdown(self, md, md_globals):
         configs = self.getConfigs()
-        self.inlinePatterns = OrderedDict()
+        self.inlinePatterns = Registry()
         if configs['smart_ellipses']:
             self.educateEllipses(md)
         if configs['smart_quotes']:
@@ -259,7 +343,16 @@ class SmartyExtension(Extension):
         if configs['smart_dashes']:
             self.educateDashes(md)
         inlineProcessor = InlineProcessor(md)
-        inlineProcessor.inlinePatterns = self.inlinePatterns
+        if all(
+            type(pattern) is SubstituteTextPattern
+            for pattern in self.inlinePatterns.values()
+        ):
+            inlineProcessor.inlinePatterns = Registry()
+            inlineProcessor.inlinePatterns['smarty'] = SubstitutionsPattern(
+                self.inlinePatterns, md
+            )
+        else:
+            inlineProcessor.inlinePatterns = self.inlinePatterns
         md.treeprocessors.add('smarty', inlineProcessor, '_end')
         md.ESCAPED_CHARS.extend(['"', "'"])
 
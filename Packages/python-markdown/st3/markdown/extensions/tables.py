@@ -19,7 +19,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 from . import Extension
 from ..blockprocessors import BlockProcessor
-from ..util import etree
+from ..util import etree, AtomicString
 import re
 PIPE_NONE = 0
 PIPE_LEFT = 1
@@ -31,33 +31,43 @@ class TableProcessor(BlockProcessor):
 
     RE_CODE_PIPES = re.compile(r'(?:(\\\\)|(\\`+)|(`+)|(\\\|)|(\|))')
     RE_END_BORDER = re.compile(r'(?<!\\)(?:\\\\)*\|$')
+    # Cells holding nothing but words or a number, which no inline pattern
+    # can match (abbreviations aside).
+    RE_PLAIN_CELL = re.compile(
+        r'^(?:[^\W\d_]+(?:[ ]+[^\W\d_]+)*|[0-9]+(?:[.,][0-9]+)*)$', re.UNICODE
+    )
 
-    def __init__(self, parser):
+    def __init__(self, parser, plain_cells=False):
         self.border = False
         self.separator = ''
+        self.plain_cells = plain_cells
+        # The last block that passed `test` and its split header row.
+        self.tested = None
         super(TableProcessor, self).__init__(parser)
 
     def test(self, parent, block):
         """
         Ensure first two rows (column header and separator row) are valid table rows.
 
-        Keep border check and separator row do avoid repeating the work.
+        Keep border check, header and separator row do avoid repeating the work.
         """
         is_table = False
-        rows = [row.strip() for row in block.split('\n')]
+        self.tested = None
+        rows = block.split('\n', 2)
         if len(rows) > 1:
-            header0 = rows[0]
+            header0 = rows[0].strip()
             self.border = PIPE_NONE
             if header0.startswith('|'):
                 self.border |= PIPE_LEFT
             if self.RE_END_BORDER.search(header0) is not None:
                 self.border |= PIPE_RIGHT
-            row = self._split_row(header0)
-            row0_len = len(row)
+            header = self._split_row(header0)
+            row0_len = len(header)
             is_table = row0_len > 1
 
             # Each row in a single column table needs at least one pipe.
             if not is_table and row0_len == 1 and self.border:
+                rows = [line.strip() for line in block.split('\n')]
                 for index in range(1, len(rows)):
                     is_table = rows[index].startswith('|')
                     if not is_table:
@@ -66,18 +76,24 @@ class TableProcessor(BlockProcessor):
                         break
 
             if is_table:
-                row = self._split_row(rows[1])
+                row = self._split_row(rows[1].strip())
                 is_table = (len(row) == row0_len) and set(''.join(row)) <= set('|:- ')
                 if is_table:
                     self.separator = row
+                    self.tested = (block, header)
 
         return is_table
 
     def run(self, parent, blocks):
         """ Parse a table block and build table. """
-        block = blocks.pop(0).split('\n')
-        header = block[0].strip()
-        rows = [] if len(block) < 3 else block[2:]
+        block = blocks.pop(0)
+        lines = block.split('\n')
+        if self.tested is not None and self.tested[0] is block:
+            header = self.tested[1]
+        else:
+            header = self._split_row(lines[0].strip())
+        self.tested = None
+        rows = lines[2:]
 
         # Get alignment of columns
         align = []
@@ -92,17 +108,25 @@ class TableProcessor(BlockProcessor):
             else:
                 align.append(None)
 
+        # Abbreviations may be any word.
+        plain = (
+            self.plain_cells and
+            'abbr' not in self.parser.markdown.inlinePatterns
+        )
+
         # Build table
         table = etree.SubElement(parent, 'table')
         thead = etree.SubElement(table, 'thead')
-        self._build_row(header, thead, align)
+        self._build_cells(header, thead, align, plain)
         tbody = etree.SubElement(table, 'tbody')
         if len(rows) == 0:
             # Handle empty table
             self._build_empty_row(tbody, align)
         else:
             for row in rows:
-                self._build_row(row.strip(), tbody, align)
+                self._build_cells(
+                    self._split_row(row.strip()), tbody, align, plain
+                )
 
     def _build_empty_row(self, parent, align):
         """Build an empty row."""
@@ -114,24 +138,44 @@ class TableProcessor(BlockProcessor):
 
     def _build_row(self, row, parent, align):
         """ Given a row of text, build table cells. """
+        self._build_cells(self._split_row(row), parent, align)
+
+    def _build_cells(self, cells, parent, align, plain=False):
+        """
+        Given the cells of a row, build table cells.
+
+        If plain is True, cells which hold only words or a number are marked
+        as atomic, so they are skipped by the inline patterns.
+        """
         tr = etree.SubElement(parent, 'tr')
         tag = 'td'
         if parent.tag == 'thead':
             tag = 'th'
-        cells = self._split_row(row)
+        is_plain = self.RE_PLAIN_CELL.match
         # We use align here rather than cells to ensure every row
         # contains the same number of columns.
         for i, a in enumerate(align):
             c = etree.SubElement(tr, tag)
             try:
-                c.text = cells[i].strip()
+                text = cells[i].strip()
             except IndexError:  # pragma: no cover
-                c.text = ""
+                text = ""
+            if plain and is_plain(text):
+                text = AtomicString(text)
+            c.text = text
             if a:
                 c.set('align', a)
 
     def _split_row(self, row):
         """ split a row of text into list of cells. """
+        if '`' not in row and '\\' not in row:
+            # Without code spans and escapes every pipe splits cells.
+            if self.border:
+                if row.startswith('|'):
+                    row = row[1:]
+                if row.endswith('|'):
+                    row = row[:-1]
+            return row.split('|')
         if self.border:
             if row.startswith('|'):
                 row = row[1:]
@@ -214,12 +258,24 @@ class TableProcessor(BlockProcessor):
 class TableExtension(Extension):
     """ Add tables to Markdown. """
 
+    def __init__(self, *args, **kwargs):
+        self.config = {
+            'plain_cells': [False,
+                            'Skip inline processing of cells which hold only '
+                            'words or a number. Only safe when no inline '
+                            'pattern matches bare words - Defaults to False']
+        }
+        super(TableExtension, self).__init__(*args, **kwargs)
+
     def extendMarkdown(self, md, md_globals):
         """ Add an instance of TableProcessor to BlockParser. """
         if '|' not in md.ESCAPED_CHARS:
             md.ESCAPED_CHARS.append('|')
         md.parser.blockprocessors.add('table',
-                                      TableProcessor(md.parser),
+                                      TableProcessor(
+                                          md.parser,
+                                          self.getConfig('plain_cells')
+                                      ),
                                       '<hashheader')
 
 
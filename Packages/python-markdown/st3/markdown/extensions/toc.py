@@ -16,8 +16,11 @@ License: [BSD](http://www.opensource.org/licenses/bsd-license.php)
 from __future__ import absolute_import
 from __future__ import unicode_literals
 from . import Extension
-from ..treeprocessors import Treeprocessor
-from ..util import etree, parseBoolValue, AMP_SUBSTITUTE, HTML_PLACEHOLDER_RE, string_type
+from ..treeprocessors import Treeprocessor, PrettifyTreeprocessor
+from ..serializers import to_html_string, to_xhtml_string, \
+    _escape_attrib_html, _escape_cdata
+from ..util import etree, parseBoolValue, AMP_SUBSTITUTE, HTML_PLACEHOLDER_RE, \
+    STX, string_type
 import re
 import unicodedata
 
@@ -44,8 +47,48 @@ def unique(id, ids):
     return id
 
 
+class UniqueIds(set):
+    """
+    A set of used ids which hands out unique ids.
+
+    Gives the same results as `unique`, but remembers for every base id how
+    many of its numbered variants are taken, so repeated ids do not probe
+    '_1', '_2'... from the start every time. Ids must not be removed.
+    """
+
+    def __init__(self, *args):
+        super(UniqueIds, self).__init__(*args)
+        # Base id => lowest count for which all of 'base_1'... 'base_<count-1>'
+        # are known to be taken.
+        self.counts = {}
+
+    def unique(self, id):
+        """ Return id, or the next free numbered variant, and mark it used. """
+        if id and id not in self:
+            self.add(id)
+            return id
+        m = IDCOUNT_RE.match(id)
+        if m:
+            base, start = m.group(1), int(m.group(2)) + 1
+        else:
+            base, start = id, 1
+        known = self.counts.get(base, 1)
+        count = max(start, known)
+        while '%s_%d' % (base, count) in self:
+            count += 1
+        if start <= known:
+            self.counts[base] = count + 1
+        id = '%s_%d' % (base, count)
+        self.add(id)
+        return id
+
+
 def stashedHTML2text(text, md):
     """ Extract raw HTML from stash, reduce to plain text and swap with placeholder. """
+    if STX not in text:
+        # No placeholders to swap.
+        return text
+
     def _html_sub(m):
         """ Substitute raw html with plain text. """
         try:
@@ -75,15 +118,15 @@ def nest_toc_tokens(toc_list):
     ordered_list = []
     if len(toc_list):
         # Initialize everything by processing the first entry
-        last = toc_list.pop(0)
+        tokens = iter(toc_list)
+        last = next(tokens)
         last['children'] = []
         levels = [last['level']]
         ordered_list.append(last)
         parents = []
 
         # Walk the rest nesting the entries properly
-        while toc_list:
-            t = toc_list.pop(0)
+        for t in tokens:
             current_level = t['level']
             t['children'] = []
 
@@ -119,6 +162,7 @@ def nest_toc_tokens(toc_list):
                 parents.append(last)
                 levels.append(current_level)
             last = t
+        del toc_list[:]
 
     return ordered_list
 
@@ -145,25 +189,39 @@ class TocTreeprocessor(Treeprocessor):
             for child in parent:
                 yield parent, child
 
-    def replace_marker(self, root, elem):
-        ''' Replace marker with elem. '''
+    def is_marker(self, c):
+        ''' Return True if the text of c is the marker. '''
+        # To keep the output from screwing up the
+        # validation by putting a <div> inside of a <p>
+        # we actually replace the <p> in its entirety.
+        # We do not allow the marker inside a header as that
+        # would causes an enless loop of placing a new TOC
+        # inside previously generated TOC.
+        return bool(
+            c.text and c.text.strip() == self.marker and
+            not self.header_rgx.match(c.tag) and c.tag not in ['pre', 'code']
+        )
+
+    def replace_marker(self, root, elem, markers=None):
+        '''
+        Replace marker with elem.
+
+        If given, only the elements in markers are replaced, otherwise the
+        whole tree is searched.
+        '''
+        if markers is not None:
+            markers = set(markers)
         for (p, c) in self.iterparent(root):
-            text = ''.join(c.itertext()).strip()
-            if not text:
+            if markers is None:
+                text = ''.join(c.itertext()).strip()
+                if not text or not self.is_marker(c):
+                    continue
+            elif c not in markers:
                 continue
-
-            # To keep the output from screwing up the
-            # validation by putting a <div> inside of a <p>
-            # we actually replace the <p> in its entirety.
-            # We do not allow the marker inside a header as that
-            # would causes an enless loop of placing a new TOC
-            # inside previously generated TOC.
-            if c.text and c.text.strip() == self.marker and \
-               not self.header_rgx.match(c.tag) and c.tag not in ['pre', 'code']:
-                for i in range(len(p)):
-                    if p[i] == c:
-                        p[i] = elem
-                        break
+            for i in range(len(p)):
+                if p[i] == c:
+                    p[i] = elem
+                    break
 
     def set_level(self, elem):
         ''' Adjust header level according to base level. '''
@@ -223,44 +281,101 @@ class TocTreeprocessor(Treeprocessor):
             prettify.run(div)
         return div
 
+    def build_toc_html(self, toc_list):
+        """
+        Return the serialized TOC div for a toc list.
+
+        The HTML is assembled directly when the Markdown instance uses a
+        stock serializer and the stock prettify treeprocessor. Otherwise the
+        div is built and serialized the regular way. Either way it is run
+        through the postprocessors.
+        """
+        md = self.markdown
+        prettify = md.treeprocessors.get('prettify')
+        if (
+            md.serializer not in (to_html_string, to_xhtml_string) or
+            prettify is None or type(prettify) is not PrettifyTreeprocessor
+        ):
+            toc = md.serializer(self.build_toc_div(toc_list))
+            for pp in md.postprocessors.values():
+                toc = pp.run(toc)
+            return toc
+
+        html = ['<div class="toc">']
+        if self.title:
+            html.append(
+                '<span class="toctitle">%s</span>' % _escape_cdata(self.title)
+            )
+        else:
+            html.append('\n')
+
+        def build_ul(toc_list):
+            html.append('<ul>\n' if toc_list else '<ul>')
+            for item in toc_list:
+                html.append('<li><a href="%s">%s</a>' % (
+                    _escape_attrib_html('#' + item.get('id', '')),
+                    _escape_cdata(item.get('name', ''))
+                ))
+                if item['children']:
+                    build_ul(item['children'])
+                html.append('</li>\n')
+            html.append('</ul>\n')
+
+        build_ul(toc_list)
+        html.append('</div>\n')
+        toc = ''.join(html)
+        for pp in md.postprocessors.values():
+            toc = pp.run(toc)
+        return toc
+
     def run(self, doc):
-        # Get a list of id attributes
-        used_ids = set()
+        # Get the id attributes, headers and markers in a single walk.
+        used_ids = UniqueIds()
+        headers = []
+        markers = []
         for el in doc.iter():
-            if "id" in el.attrib:
-                used_ids.add(el.attrib["id"])
+            id = el.get('id')
+            if id is not None:
+                used_ids.add(id)
+            if not isinstance(el.tag, string_type):
+                continue
+            if self.header_rgx.match(el.tag):
+                headers.append(el)
+            elif self.marker and self.is_marker(el):
+                markers.append(el)
 
         toc_tokens = []
-        for el in doc.iter():
-            if isinstance(el.tag, string_type) and self.header_rgx.match(el.tag):
-                self.set_level(el)
-                text = ''.join(el.itertext()).strip()
-
-                # Do not override pre-existing ids
-                if "id" not in el.attrib:
-                    innertext = stashedHTML2text(text, self.markdown)
-                    el.attrib["id"] = unique(self.slugify(innertext, self.sep), used_ids)
-
-                toc_tokens.append({
-                    'level': int(el.tag[-1]),
-                    'id': el.attrib["id"],
-                    'name': text
-                })
-
-                if self.use_anchors:
-                    self.add_anchor(el, el.attrib["id"])
-                if self.use_permalinks:
-                    self.add_permalink(el, el.attrib["id"])
-
-        div = self.build_toc_div(nest_toc_tokens(toc_tokens))
-        if self.marker:
-            self.replace_marker(doc, div)
+        for el in headers:
+            self.set_level(el)
+            text = ''.join(el.itertext()).strip()
+
+            # Do not override pre-existing ids
+            id = el.get('id')
+            if id is None:
+                innertext = stashedHTML2text(text, self.markdown)
+                id = used_ids.unique(self.slugify(innertext, self.sep))
+                el.attrib["id"] = id
+
+            toc_tokens.append({
+                'level': int(el.tag[-1]),
+                'id': id,
+                'name': text
+            })
+
+            if self.use_anchors:
+                self.add_anchor(el, id)
+            if self.use_permalinks:
+                self.add_permalink(el, id)
+                if self.marker and self.is_marker(el[-1]):
+                    # Permalink text may be set to the marker too.
+                    markers.append(el[-1])
+
+        toc_list = nest_toc_tokens(toc_tokens)
+        if markers:
+            self.replace_marker(doc, self.build_toc_div(toc_list), markers)
 
         # serialize and attach to markdown instance.
-        toc = self.markdown.serializer(div)
-        for pp in self.markdown.postprocessors.values():
-            toc = pp.run(toc)
-        self.markdown.toc = toc
+        self.markdown.toc = self.build_toc_html(toc_list)
 
 
 class TocExtension(Extension):
@@ -58,7 +58,7 @@ except ImportError:  # pragma: no cover
 
 def build_inlinepatterns(md_instance, **kwargs):
     """ Build the default set of inline patterns for Markdown. """
-    inlinePatterns = odict.OrderedDict()
+    inlinePatterns = odict.Registry()
     inlinePatterns["backtick"] = BacktickPattern(BACKTICK_RE)
     inlinePatterns["escape"] = EscapePattern(ESCAPE_RE, md_instance)
     inlinePatterns["reference"] = ReferencePattern(REFERENCE_RE, md_instance)
@@ -180,6 +180,27 @@ def handleAttributes(text, parent):
     return ATTR_RE.sub(attributeCallback, text)
 
 
+# Compiled regular expressions of inline patterns by (pattern, flags), shared
+# by all Markdown instances.  It is emptied once it holds MAX_COMPILED
+# expressions.
+_compiled = {}
+MAX_COMPILED = 512
+
+
+def compile_pattern(pattern, flags=re.DOTALL | re.UNICODE):
+    """ Return the compiled regular expression of an inline pattern. """
+    key = (pattern, flags)
+    try:
+        return _compiled[key]
+    except KeyError:
+        if len(_compiled) >= MAX_COMPILED:
+            _compiled.clear()
+        compiled = _compiled[key] = re.compile(
+            r"^(.*?)%s(.*)$" % pattern, flags
+        )
+        return compiled
+
+
 """
 The pattern classes
 -----------------------------------------------------------------------------
@@ -201,8 +222,7 @@ class Pattern(object):
 
         """
         self.pattern = pattern
-        self.compiled_re = re.compile(r"^(.*?)%s(.*)$" % pattern,
-                                      re.DOTALL | re.UNICODE)
+        self.compiled_re = compile_pattern(pattern)
 
         # Api for Markdown to pass safe_mode into instance
         self.safe_mode = False
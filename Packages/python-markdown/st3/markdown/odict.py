@@ -189,3 +189,128 @@ class OrderedDict(dict):
             # restore to prevent data loss and reraise
             self.keyOrder.insert(n, key)
             raise e
+
+
+class Registry(OrderedDict):
+    """
+    An `OrderedDict` for the processor and pattern registries of Markdown.
+
+    The keys are kept in the `keyOrder` array, whose order is the priority of
+    each item.  On top of that, a name to slot map and a snapshot of the
+    values in order are cached, so location lookups (`<key`, `>key`) and
+    index access in the inline loop do not scan the key array.  Both caches
+    are dropped on every change to the registry.
+
+    """
+
+    def __new__(cls, *args, **kwargs):
+        instance = super(Registry, cls).__new__(cls, *args, **kwargs)
+        instance._slots = None
+        instance._snapshot = None
+        return instance
+
+    def _changed(self):
+        """ Drop the cached slot map and values snapshot. """
+        self._slots = None
+        self._snapshot = None
+
+    def _values_snapshot(self):
+        """ Return a tuple of the values in order. """
+        snapshot = self._snapshot
+        if snapshot is None:
+            get = super(Registry, self).__getitem__
+            snapshot = self._snapshot = tuple(get(k) for k in self.keyOrder)
+        return snapshot
+
+    def __setitem__(self, key, value):
+        if key in self:
+            # Replaced in place: the slots stay valid.
+            dict.__setitem__(self, key, value)
+            self._snapshot = None
+        else:
+            super(Registry, self).__setitem__(key, value)
+            self._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        del self.keyOrder[self.index(key)]
+        self._changed()
+
+    def pop(self, k, *args):
+        result = super(Registry, self).pop(k, *args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super(Registry, self).popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, key, default):
+        result = super(Registry, self).setdefault(key, default)
+        self._changed()
+        return result
+
+    def insert(self, index, key, value):
+        """Inserts the key, value pair before the item with the given index."""
+        if key in self:
+            n = self.index(key)
+            del self.keyOrder[n]
+            if n < index:
+                index -= 1
+        self.keyOrder.insert(index, key)
+        dict.__setitem__(self, key, value)
+        self._changed()
+
+    def clear(self):
+        super(Registry, self).clear()
+        self._changed()
+
+    def link(self, key, location):
+        """ Change location of an existing item. """
+        n = self.index(key)
+        del self.keyOrder[n]
+        self._changed()
+        try:
+            i = self.index_for_location(location)
+            if i is not None:
+                self.keyOrder.insert(i, key)
+            else:
+                self.keyOrder.append(key)
+        except Exception as e:
+            # restore to prevent data loss and reraise
+            self.keyOrder.insert(n, key)
+            raise e
+        finally:
+            self._changed()
+
+    def _itervalues(self):
+        return iter(self._values_snapshot())
+
+    if util.PY3:  # pragma: no cover
+        def values(self):
+            return self._values_snapshot()
+    else:  # pragma: no cover
+        itervalues = _itervalues
+
+        def values(self):
+            return list(self._values_snapshot())
+
+    def value_for_index(self, index):
+        """Returns the value of the item at the given zero-based index."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._values_snapshot()
+        return snapshot[index]
+
+    def index(self, key):
+        """ Return the index of a given key. """
+        slots = self._slots
+        if slots is None:
+            slots = self._slots = dict(
+                (k, i) for i, k in enumerate(self.keyOrder)
+            )
+        try:
+            return slots[key]
+        except KeyError:
+            raise ValueError("Element '%s' was not found in OrderedDict" % key)
@@ -18,7 +18,7 @@ import re
 
 def build_postprocessors(md_instance, **kwargs):
     """ Build the default postprocessors for Markdown. """
-    postprocessors = odict.OrderedDict()
+    postprocessors = odict.Registry()
     postprocessors["raw_html"] = RawHtmlPostprocessor(md_instance)
     postprocessors["amp_substitute"] = AndSubstitutePostprocessor()
     postprocessors["unescape"] = UnescapePostprocessor()
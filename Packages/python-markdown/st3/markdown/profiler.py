@@ -0,0 +1,256 @@
+"""
+PROFILER
+=============================================================================
+
+Opt-in timing and counters for the processing stages of a Markdown instance.
+
+When a Markdown instance is created with `profile=True`, every registered
+preprocessor, block processor, inline pattern, treeprocessor and
+postprocessor is wrapped so that its wall time and invocation counts are
+recorded.  The wrappers are installed as instance attributes on the processor
+objects, so nothing changes in the processing loops themselves and an
+instance without a profiler pays nothing.
+
+Times are inclusive: the time of the "inline" treeprocessor, for instance,
+also contains the time spent in the inline patterns it runs.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+from timeit import default_timer
+
+
+# Registries on the Markdown instance, in processing order, along with the
+# methods that get wrapped for each of their processors.
+STAGES = (
+    ('preprocessors', ('run',)),
+    ('blockprocessors', ('test', 'run')),
+    ('inlinePatterns', ('getCompiledRegExp', 'handleMatch')),
+    ('treeprocessors', ('run',)),
+    ('postprocessors', ('run',)),
+)
+
+
+_MISSING = object()
+
+
+class Stats(object):
+    """ Counters for a single registered processor. """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """ Zero all counters. """
+        self.calls = 0
+        self.time = 0.0
+        self.attempts = 0
+        self.matches = 0
+
+    def as_dict(self):
+        """ Return the counters as a dictionary. """
+        return {
+            'calls': self.calls,
+            'time': self.time,
+            'attempts': self.attempts,
+            'matches': self.matches
+        }
+
+
+class TimedRegExp(object):
+    """
+    Stand-in for a compiled inline pattern regular expression.
+
+    Counts every `match` call as an attempt and every successful one as a
+    match.  All other attributes are looked up on the wrapped expression.
+
+    """
+
+    def __init__(self, regexp, stats):
+        self.regexp = regexp
+        self.stats = stats
+
+    def match(self, *args, **kwargs):
+        stats = self.stats
+        start = default_timer()
+        m = self.regexp.match(*args, **kwargs)
+        stats.time += default_timer() - start
+        stats.attempts += 1
+        if m:
+            stats.matches += 1
+        return m
+
+    def __getattr__(self, name):
+        return getattr(self.regexp, name)
+
+
+class Profiler(object):
+    """
+    Record time and counters per registered processor.
+
+    Creating a profiler wraps `convert` of the given Markdown instance so
+    that processors are instrumented right before each conversion.
+
+    """
+
+    def __init__(self, md):
+        self.markdown = md
+        self.stats = dict((stage, {}) for stage, methods in STAGES)
+        self.stats['serializer'] = {}
+        self.conversions = 0
+        self.total = 0.0
+        # (object, attribute name, previous instance attribute) tuples for
+        # every wrapper installed.
+        self._wrapped = []
+        self._wrap_convert()
+
+    def _wrap_convert(self):
+        """ Time every conversion and instrument new processors first. """
+        original = self.markdown.convert
+
+        def convert(source):
+            self.instrument()
+            start = default_timer()
+            try:
+                return original(source)
+            finally:
+                self.total += default_timer() - start
+                self.conversions += 1
+        self._install(self.markdown, 'convert', convert)
+
+    def instrument(self):
+        """
+        Wrap all registered processors which are not wrapped yet.
+
+        This is called at the start of every conversion, so processors added
+        later on (for instance by a preprocessor) are picked up as well.
+
+        """
+        md = self.markdown
+        for stage, methods in STAGES:
+            if stage == 'blockprocessors':
+                registry = md.parser.blockprocessors
+            else:
+                registry = getattr(md, stage)
+            for key in registry:
+                processor = registry[key]
+                stats = self.stats[stage].setdefault(key, Stats())
+                for name in methods:
+                    self._wrap(processor, name, stats)
+        if not getattr(md.parser.parseDocument, '_profiled', False):
+            # Preprocessors may register new processors (abbreviations, for
+            # instance), so look again once the block parser starts.
+            original = md.parser.parseDocument
+
+            def parseDocument(lines):
+                self.instrument()
+                return original(lines)
+            self._install(md.parser, 'parseDocument', parseDocument)
+        serializers = self.stats['serializer']
+        self._wrap(
+            md, 'serializer', serializers.setdefault(md.output_format, Stats())
+        )
+
+    def _wrap(self, obj, name, stats):
+        """ Install a counting wrapper for `obj.name`. """
+        original = getattr(obj, name, None)
+        if original is None or getattr(original, '_profiled', False):
+            return
+
+        if name == 'getCompiledRegExp':
+            def wrapper():
+                return TimedRegExp(original(), stats)
+        elif name == 'test':
+            def wrapper(*args, **kwargs):
+                start = default_timer()
+                result = original(*args, **kwargs)
+                stats.time += default_timer() - start
+                stats.attempts += 1
+                if result:
+                    stats.matches += 1
+                return result
+        else:
+            def wrapper(*args, **kwargs):
+                start = default_timer()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    stats.time += default_timer() - start
+                    stats.calls += 1
+        self._install(obj, name, wrapper)
+
+    def _install(self, obj, name, wrapper):
+        """ Set `wrapper` as the instance attribute `name` of `obj`. """
+        wrapper._profiled = True
+        previous = getattr(obj, '__dict__', {}).get(name, _MISSING)
+        try:
+            setattr(obj, name, wrapper)
+        except AttributeError:  # pragma: no cover
+            # Objects with `__slots__` cannot be instrumented.
+            return
+        self._wrapped.append((obj, name, previous))
+
+    def remove(self):
+        """ Remove all installed wrappers, including the one on `convert`. """
+        for obj, name, previous in reversed(self._wrapped):
+            if not getattr(getattr(obj, name, None), '_profiled', False):
+                # Replaced by someone else since; leave it alone.
+                continue
+            if previous is _MISSING:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, previous)
+        self._wrapped = []
+
+    def reset(self):
+        """ Clear all recorded counters. """
+        # Keep the `Stats` objects as the installed wrappers refer to them.
+        for stage in self.stats.values():
+            for stats in stage.values():
+                stats.clear()
+        self.conversions = 0
+        self.total = 0.0
+
+    def report(self):
+        """
+        Return the recorded counters as a dictionary.
+
+        The dictionary maps each stage name to an ordered list of
+        `(key, counters)` tuples, where `counters` is a dictionary with
+        `calls`, `time`, `attempts` and `matches`.  The `conversions` and
+        `total` entries hold the number of conversions and their total time.
+
+        """
+        report = {
+            'conversions': self.conversions,
+            'total': self.total
+        }
+        for stage, methods in STAGES + (('serializer', ()),):
+            report[stage] = [
+                (key, stats.as_dict())
+                for key, stats in self.stats[stage].items()
+            ]
+            report[stage].sort(key=lambda x: -x[1]['time'])
+        return report
+
+    def format_report(self):
+        """ Return the recorded counters as a human readable table. """
+        report = self.report()
+        lines = [
+            'Conversions: %d, total time: %.6fs' % (
+                report['conversions'], report['total']
+            )
+        ]
+        for stage, methods in STAGES + (('serializer', ()),):
+            lines.append('')
+            lines.append('%-40s %10s %10s %10s %12s' % (
+                stage, 'calls', 'attempts', 'matches', 'time (s)'
+            ))
+            for key, stats in report[stage]:
+                lines.append('  %-38s %10d %10d %10d %12.6f' % (
+                    key, stats['calls'], stats['attempts'],
+                    stats['matches'], stats['time']
+                ))
+        return '\n'.join(lines) + '\n'
+
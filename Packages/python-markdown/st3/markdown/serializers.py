@@ -137,21 +137,46 @@ def _escape_attrib_html(text):
         _raise_serialization_error(text)
 
 
+class _NamespaceRequired(Exception):
+    """Raised when a tree needs the full namespace pass to serialize."""
+    pass
+
+
 def _serialize_html(write, elem, qnames, namespaces, format):
-    tag = elem.tag
-    text = elem.text
-    if tag is Comment:
-        write("<!--%s-->" % _escape_cdata(text))
-    elif tag is ProcessingInstruction:
-        write("<?%s?>" % _escape_cdata(text))
-    else:
-        tag = qnames[tag]
-        if tag is None:
-            if text:
-                write(_escape_cdata(text))
-            for e in elem:
-                _serialize_html(write, e, qnames, None, format)
+    # Walk the tree with an explicit stack so deeply nested documents are not
+    # limited by the recursion depth.  The stack holds either elements still
+    # to be written, or `(text,)` tuples of serialized end tags and tails to be
+    # written verbatim.
+    # When `qnames` is `None`, the tree is assumed to only use plain names and
+    # `_NamespaceRequired` is raised as soon as that assumption fails.
+    stack = [elem]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        elem = pop()
+        if isinstance(elem, tuple):
+            write(elem[0])
+            continue
+        tag = elem.tag
+        text = elem.text
+        if tag is Comment:
+            write("<!--%s-->" % _escape_cdata(text))
+        elif tag is ProcessingInstruction:
+            write("<?%s?>" % _escape_cdata(text))
         else:
+            if qnames is not None:
+                tag = qnames[tag]
+            elif tag is not None and (
+                not isinstance(tag, util.string_type) or tag[:1] == "{"
+            ):
+                raise _NamespaceRequired
+            if tag is None:
+                if text:
+                    write(_escape_cdata(text))
+                if elem.tail:
+                    push((_escape_cdata(elem.tail),))
+                stack.extend(reversed(elem))
+                continue
             write("<" + tag)
             items = elem.items()
             if items or namespaces:
@@ -159,37 +184,51 @@ def _serialize_html(write, elem, qnames, namespaces, format):
                 for k, v in items:
                     if isinstance(k, QName):
                         k = k.text
-                    if isinstance(v, QName):
-                        v = qnames[v.text]
-                    else:
+                    if qnames is None:
+                        if isinstance(v, QName) or k[:1] == "{":
+                            raise _NamespaceRequired
+                        name = k
                         v = _escape_attrib_html(v)
-                    if qnames[k] == v and format == 'html':
+                    else:
+                        name = qnames[k]
+                        if isinstance(v, QName):
+                            v = qnames[v.text]
+                        else:
+                            v = _escape_attrib_html(v)
+                    if name == v and format == 'html':
                         # handle boolean attributes
                         write(" %s" % v)
                     else:
-                        write(" %s=\"%s\"" % (qnames[k], v))
+                        write(" %s=\"%s\"" % (name, v))
                 if namespaces:
-                    items = namespaces.items()
-                    items.sort(key=lambda x: x[1])  # sort on prefix
+                    # sort on prefix
+                    items = sorted(namespaces.items(), key=lambda x: x[1])
                     for v, k in items:
                         if k:
                             k = ":" + k
                         write(" xmlns%s=\"%s\"" % (k, _escape_attrib(v)))
-            if format == "xhtml" and tag.lower() in HTML_EMPTY:
+                    namespaces = None
+            lower = tag.lower()
+            if format == "xhtml" and lower in HTML_EMPTY:
                 write(" />")
             else:
                 write(">")
                 if text:
-                    if tag.lower() in ["script", "style"]:
+                    if lower in ("script", "style"):
                         write(text)
                     else:
                         write(_escape_cdata(text))
-                for e in elem:
-                    _serialize_html(write, e, qnames, None, format)
-                if tag.lower() not in HTML_EMPTY:
-                    write("</" + tag + ">")
-    if elem.tail:
-        write(_escape_cdata(elem.tail))
+                if lower not in HTML_EMPTY:
+                    if elem.tail:
+                        push(("</" + tag + ">" + _escape_cdata(elem.tail),))
+                    else:
+                        push(("</" + tag + ">",))
+                elif elem.tail:
+                    push((_escape_cdata(elem.tail),))
+                stack.extend(reversed(elem))
+                continue
+        if elem.tail:
+            write(_escape_cdata(elem.tail))
 
 
 def _write_html(root,
@@ -197,14 +236,32 @@ def _write_html(root,
                 default_namespace=None,
                 format="html"):
     assert root is not None
+    if not hasattr(root, "tag"):
+        # Only elements can be serialized.  Callers such as
+        # `HtmlPattern.unescape` rely on this error for anything else.
+        raise AttributeError(
+            "'%s' object has no attribute 'tag'" % type(root).__name__
+        )
     data = []
-    write = data.append
+    if default_namespace is None:
+        # Most trees only use plain tag and attribute names, so try to
+        # serialize without the namespace pass first.
+        try:
+            _serialize_html(data.append, root, None, None, format)
+        except _NamespaceRequired:
+            data = []
+        else:
+            return _finish_html(data, encoding)
     qnames, namespaces = _namespaces(root, default_namespace)
-    _serialize_html(write, root, qnames, namespaces, format)
+    _serialize_html(data.append, root, qnames, namespaces, format)
+    return _finish_html(data, encoding)
+
+
+def _finish_html(data, encoding):
     if encoding is None:
         return "".join(data)
     else:
-        return _encode("".join(data))
+        return _encode("".join(data), encoding)
 
 
 # --------------------------------------------------------------------
@@ -7,7 +7,7 @@ from . import inlinepatterns
 
 def build_treeprocessors(md_instance, **kwargs):
     """ Build the default treeprocessors for Markdown. """
-    treeprocessors = odict.OrderedDict()
+    treeprocessors = odict.Registry()
     treeprocessors["inline"] = InlineProcessor(md_instance)
     treeprocessors["prettify"] = PrettifyTreeprocessor(md_instance)
     return treeprocessors
@@ -0,0 +1,6 @@
+"""Unit Tests."""
+import os
+import sys
+
+# Import the bundled copy of Markdown.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'st3'))
@@ -0,0 +1,86 @@
+"""Test caches."""
+from __future__ import unicode_literals
+import threading
+import unittest
+import markdown
+from markdown.cache import LRUCache, ConversionCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRU cache."""
+
+    def test_evict_least_recently_used(self):
+        """Test that the least recently used entry goes first."""
+
+        cache = LRUCache(max_entries=2)
+        cache.store('a', 1)
+        cache.store('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.store('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_max_bytes(self):
+        """Test that sizes bound the cache."""
+
+        cache = LRUCache(max_bytes=10)
+        cache.store('a', 'a', 6)
+        cache.store('b', 'b', 6)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 6)
+        cache.store('c', 'c', 11)
+        self.assertIsNone(cache.get('c'))
+        cache.store('b', 'b', 4)
+        self.assertEqual(cache.size, 4)
+
+    def test_check(self):
+        """Test that rejected entries are dropped and counted as misses."""
+
+        cache = LRUCache()
+        cache.store('a', 1, 5)
+        self.assertEqual(cache.get('a', 'x', check=lambda value: value == 2), 'x')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_threads(self):
+        """Test concurrent use."""
+
+        cache = LRUCache(max_entries=8, max_bytes=40)
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(2000):
+                    key = (i + offset) % 13
+                    if cache.get(key) is None:
+                        cache.store(key, key, key % 7)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 8)
+        self.assertEqual(cache.size, sum(cache.sizes.values()))
+        self.assertLessEqual(cache.size, 40)
+
+
+class TestConversionCache(unittest.TestCase):
+    """Test the conversion cache."""
+
+    def test_hit(self):
+        """Test that a second conversion is served from the cache."""
+
+        cache = ConversionCache(max_entries=4)
+        html = markdown.markdown('# Title\n\ntext', extensions=['markdown.extensions.toc'], cache=cache)
+        self.assertEqual(
+            markdown.markdown('# Title\n\ntext', extensions=['markdown.extensions.toc'], cache=cache), html
+        )
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
@@ -0,0 +1,45 @@
+"""Test the command line options."""
+from __future__ import unicode_literals
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from markdown.__main__ import parse_options
+
+
+class TestBatchOptions(unittest.TestCase):
+    """Test options in batch mode."""
+
+    def setUp(self):
+        """Create an input directory and silence the usage errors."""
+
+        self.tempdir = tempfile.mkdtemp()
+        self.stderr = sys.stderr
+        sys.stderr = open(os.devnull, 'w')
+
+    def tearDown(self):
+        """Clean up."""
+
+        sys.stderr.close()
+        sys.stderr = self.stderr
+        shutil.rmtree(self.tempdir)
+
+    def test_batch(self):
+        """Test that a directory selects batch mode."""
+
+        options, level = parse_options(['-j', '2', self.tempdir])
+        self.assertEqual(options['inputs'], [self.tempdir])
+        self.assertEqual(options['jobs'], 2)
+
+    def test_profile(self):
+        """Test that profiling is rejected rather than ignored."""
+
+        with self.assertRaises(SystemExit):
+            parse_options(['-p', self.tempdir])
+
+    def test_output_file(self):
+        """Test that a single output file is rejected rather than ignored."""
+
+        with self.assertRaises(SystemExit):
+            parse_options(['-f', 'out.html', self.tempdir])
@@ -0,0 +1,36 @@
+"""Test reading meta-data."""
+from __future__ import unicode_literals
+import io
+import unittest
+import markdown
+from markdown.extensions import meta
+from markdown.extensions.meta import MetaExtension
+
+
+class TestReadMeta(unittest.TestCase):
+    """Test that reading meta-data agrees with converting."""
+
+    def assertSameMeta(self, source, **kwargs):
+        """Check `read_meta` and `read_meta_file` against `convert`."""
+
+        md = markdown.Markdown(extensions=[MetaExtension(**kwargs)])
+        md.convert(source)
+        expected = md.Meta
+        self.assertEqual(md.read_meta(source), expected)
+        self.assertEqual(md.read_meta_file(io.BytesIO(source.encode('utf-8'))), expected)
+        for size in (1, 2, 5):
+            lines = md._read_lines(io.BytesIO(source.encode('utf-8')), 'utf-8', size)
+            self.assertEqual(md._read_meta(lines, True), expected)
+        return expected
+
+    def test_line_endings(self):
+        """Test that only line feeds and carriage returns end lines."""
+
+        result = self.assertSameMeta('Title: A\rAuthor: B\r\nSummary: x\x0cy\u2028z\r\n\rtext')
+        self.assertEqual(result['summary'], ['x\x0cy\u2028z'])
+
+    @unittest.skipIf(meta.yaml is None, 'PyYAML is not installed')
+    def test_yaml_blank_line(self):
+        """Test that a whitespace only line after the YAML start is blank."""
+
+        self.assertEqual(self.assertSameMeta('---\n  \ntitle: x\n---\n\ntext', yaml=True), {})
@@ -0,0 +1,44 @@
+"""Test serializers."""
+from __future__ import unicode_literals
+import unittest
+import markdown
+from markdown import serializers
+from markdown import util
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the HTML serializers."""
+
+    def test_string_root(self):
+        """Test that only elements are serialized."""
+
+        with self.assertRaises(AttributeError):
+            serializers.to_html_string('text')
+        with self.assertRaises(AttributeError):
+            serializers.to_xhtml_string('text')
+
+    def test_inline_html_escapes(self):
+        """Test that backslash escapes in inline raw HTML are kept."""
+
+        self.assertEqual(
+            markdown.markdown(r'x <span title="a\*b">y</span> z'),
+            r'<p>x <span title="a\*b">y</span> z</p>'
+        )
+
+    def test_tails(self):
+        """Test that end tags and tails are written in order."""
+
+        root = util.etree.Element('div')
+        p = util.etree.SubElement(root, 'p')
+        p.text = 'a < b'
+        p.tail = 'tail & more'
+        br = util.etree.SubElement(p, 'br')
+        br.tail = 'after'
+        self.assertEqual(
+            serializers.to_html_string(root),
+            '<div><p>a &lt; b<br>after</p>tail &amp; more</div>'
+        )
+        self.assertEqual(
+            serializers.to_xhtml_string(root),
+            '<div><p>a &lt; b<br />after</p>tail &amp; more</div>'
+        )
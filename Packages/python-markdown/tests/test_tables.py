@@ -0,0 +1,35 @@
+"""Test tables."""
+from __future__ import unicode_literals
+import unittest
+import markdown
+from markdown.extensions import Extension
+from markdown.extensions.tables import TableExtension
+from markdown.inlinepatterns import SimpleTagPattern
+
+
+class WordExtension(Extension):
+    """Emphasize a bare word."""
+
+    def extendMarkdown(self, md, md_globals):
+        """Register the pattern."""
+
+        md.inlinePatterns.add('word', SimpleTagPattern(r'()\b(word)\b', 'em'), '_end')
+
+
+class TestPlainCells(unittest.TestCase):
+    """Test skipping inline processing of plain cells."""
+
+    text = 'a | b\n--- | ---\nword | 1'
+
+    def test_default(self):
+        """Test that inline patterns see every cell by default."""
+
+        html = markdown.markdown(self.text, extensions=[TableExtension(), WordExtension()])
+        self.assertIn('<td><em>word</em></td>', html)
+
+    def test_plain_cells(self):
+        """Test that plain cells are skipped when enabled."""
+
+        html = markdown.markdown(self.text, extensions=[TableExtension(plain_cells=True), WordExtension()])
+        self.assertIn('<td>word</td>', html)
+        self.assertIn('<td>1</td>', html)
@@ -0,0 +1,39 @@
+"""Test the table of contents."""
+from __future__ import unicode_literals
+import unittest
+import markdown
+from markdown.extensions import Extension
+from markdown.postprocessors import Postprocessor
+
+
+class ListClassPostprocessor(Postprocessor):
+    """Add a class to lists."""
+
+    def run(self, text):
+        """Add the class."""
+
+        return text.replace('<ul>', '<ul class="list">')
+
+
+class ListClassExtension(Extension):
+    """Register the postprocessor."""
+
+    def extendMarkdown(self, md, md_globals):
+        """Register the postprocessor."""
+
+        md.postprocessors.add('list_class', ListClassPostprocessor(md), '_end')
+
+
+class TestTocPostprocessors(unittest.TestCase):
+    """Test that the TOC is postprocessed like the document."""
+
+    def test_custom_postprocessor(self):
+        """Test that third-party postprocessors see the TOC."""
+
+        md = markdown.Markdown(extensions=['markdown.extensions.toc', ListClassExtension()])
+        md.convert('# A\n\n## B')
+        self.assertEqual(
+            md.toc,
+            '<div class="toc">\n<ul class="list">\n<li><a href="#a">A</a>'
+            '<ul class="list">\n<li><a href="#b">B</a></li>\n</ul>\n</li>\n</ul>\n</div>\n'
+        )
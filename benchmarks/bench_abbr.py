@@ -0,0 +1,40 @@
+"""
+Benchmark the abbreviation extension.
+
+Converts a 2,000-sentence document that uses ten abbreviations, followed by glossaries of growing size.
+"""
+from __future__ import unicode_literals
+import random
+import string
+import common
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000], help='Glossary sizes.')
+    args = p.parse_args()
+    common.setup(args)
+
+    import markdown
+
+    rand = random.Random(0)
+    words = set()
+    while len(words) < max(args.sizes):
+        words.add(''.join(rand.choice(string.ascii_uppercase) for _ in range(rand.randint(2, 6))))
+    words = sorted(words)
+    body = ' '.join(rand.choice(words[:10]) + ' lorem ipsum dolor' for _ in range(2000))
+    body = '\n\n'.join(body[i:i + 400] for i in range(0, len(body), 400))
+
+    rows = []
+    for size in args.sizes:
+        text = body + '\n\n' + '\n'.join('*[%s]: Title %s' % (word, word) for word in words[:size])
+        md = markdown.Markdown(extensions=['markdown.extensions.abbr'])
+        elapsed = common.best(lambda: md.reset().convert(text), args.repeat)
+        rows.append((size, '%.3f' % elapsed))
+    common.report(('abbreviations', 'time (s)'), rows)
+
+
+if __name__ == '__main__':
+    main()
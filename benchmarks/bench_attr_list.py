@@ -0,0 +1,56 @@
+"""
+Benchmark the attribute list extension.
+
+Converts a document of sections that each have a header, an inline and a block attribute list, and reports the
+time spent in the attr_list treeprocessor along with the total conversion time.
+"""
+from __future__ import unicode_literals
+import timeit
+import common
+
+SECTION = '''## Section %d {: .section #s%d }
+
+Some *text*{: .em } here with words.
+{: .para data-role="note" }
+
+Plain paragraph %d without attributes, *emphasis* and `code`.'''
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--sections', type=int, default=3000, help='Number of sections in the document.')
+    args = p.parse_args()
+    common.setup(args)
+
+    import markdown
+
+    text = '\n\n'.join(SECTION % (i, i, i) for i in range(args.sections))
+    md = markdown.Markdown(extensions=['markdown.extensions.attr_list'])
+    processor = md.treeprocessors['attr_list']
+    run = processor.run
+    spent = [0.0]
+
+    def timed_run(doc):
+        start = timeit.default_timer()
+        result = run(doc)
+        spent[0] += timeit.default_timer() - start
+        return result
+
+    processor.run = timed_run
+
+    times = []
+    for i in range(args.repeat):
+        spent[0] = 0.0
+        start = timeit.default_timer()
+        md.reset().convert(text)
+        times.append((spent[0], timeit.default_timer() - start))
+    common.report(
+        ('sections', 'attr_list (s)', 'total (s)'),
+        [(args.sections, '%.3f' % min(t[0] for t in times), '%.3f' % min(t[1] for t in times))]
+    )
+
+
+if __name__ == '__main__':
+    main()
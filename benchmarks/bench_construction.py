@@ -0,0 +1,48 @@
+"""
+Benchmark building Markdown instances.
+
+Reports the average time to build a Markdown instance for a few sets of extensions, for callers that create many
+short-lived instances.  The first instance of each set is built before timing starts, so that imports and the
+shared caches of extension modules and compiled patterns are warm.
+"""
+from __future__ import unicode_literals
+import common
+
+CONFIGURATIONS = (
+    ('extra, toc, smarty, codehilite, admonition, sane_lists', (
+        'markdown.extensions.extra',
+        'markdown.extensions.toc',
+        'markdown.extensions.smarty',
+        'markdown.extensions.codehilite',
+        'markdown.extensions.admonition',
+        'markdown.extensions.sane_lists'
+    )),
+    ('short names: tables, footnotes', ('tables', 'footnotes'))
+)
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--number', type=int, default=100, help='Instances built per run.')
+    args = p.parse_args()
+    common.setup(args)
+
+    import markdown
+
+    rows = []
+    for label, extensions in CONFIGURATIONS:
+        markdown.Markdown(extensions=list(extensions))
+
+        def build():
+            for i in range(args.number):
+                markdown.Markdown(extensions=list(extensions))
+
+        elapsed = common.best(build, args.repeat) / args.number
+        rows.append((label, '%.3f' % (elapsed * 1000)))
+    common.report(('extensions', 'time (ms)'), rows)
+
+
+if __name__ == '__main__':
+    main()
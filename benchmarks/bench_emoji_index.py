@@ -0,0 +1,60 @@
+"""
+Benchmark loading the emoji indexes.
+
+Compares the load time and peak memory of the autogen dictionary modules and the compact blobs of
+`pymdownx.emoji_index`.  Each case runs in a fresh process; the first run of each case only compiles and caches
+byte code.
+"""
+from __future__ import unicode_literals
+import subprocess
+import sys
+import common
+
+LOAD = r'''
+import sys, time
+sys.path[:0] = %r
+try:
+    import resource
+    def rss():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    def rss():
+        return 0
+import pymdownx.emoji_index as emoji_index
+start_rss = rss()
+start = time.time()
+if %r:
+    index = emoji_index.load_index(%r)
+else:
+    import importlib
+    module = importlib.import_module('pymdownx.' + %r)
+    index = {"name": module.name, "emoji": module.emoji, "aliases": module.aliases}
+index['emoji'].get(index['aliases'].get(':thumbsup:', ':thumbsup:'))
+sys.stdout.write('%%f %%d' %% (time.time() - start, rss() - start_rss))
+'''
+
+
+def main():
+    """Run the benchmark."""
+
+    args = common.parser(__doc__).parse_args()
+    common.setup(args)
+
+    from pymdownx import emoji_index
+
+    paths = [str(path) for path in common.package_paths(args.tree)]
+    rows = []
+    for database in emoji_index.DATABASES:
+        for compact in (False, True):
+            code = LOAD % (paths, compact, str(database), str(database))
+            results = []
+            for i in range(args.repeat + 1):
+                results.append(subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').split())
+            elapsed = min(float(result[0]) for result in results[1:])
+            memory = max(int(result[1]) for result in results[1:])
+            rows.append((database, 'compact' if compact else 'dict', '%.4f' % elapsed, memory))
+    common.report(('database', 'format', 'time (s)', 'max rss delta (KiB)'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Benchmark the footnotes extension.
+
+Converts documents with a growing number of footnotes, each with one reference and a two-line definition, to show
+how conversion time grows with the number of footnotes.
+"""
+from __future__ import unicode_literals
+import common
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--footnotes', type=int, nargs='+', default=[2000, 4000, 8000], help='Footnote counts.')
+    args = p.parse_args()
+    common.setup(args)
+
+    import markdown
+
+    rows = []
+    for count in args.footnotes:
+        text = '\n\n'.join('Para %d with a note[^n%d].' % (i, i) for i in range(count)) + '\n\n' + '\n\n'.join(
+            '[^n%d]: Note %d\n    continued' % (i, i) for i in range(count)
+        )
+        md = markdown.Markdown(extensions=['markdown.extensions.footnotes'])
+        elapsed = common.best(lambda: md.reset().convert(text), args.repeat)
+        rows.append((count, '%.3f' % elapsed, '%.1f' % (elapsed * 1000000 / count)))
+    common.report(('footnotes', 'time (s)', 'per footnote (us)'), rows)
+
+
+if __name__ == '__main__':
+    main()
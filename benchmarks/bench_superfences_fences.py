@@ -0,0 +1,42 @@
+"""
+Benchmark the SuperFences preprocessor.
+
+Runs the fenced block preprocessor over documents with a growing number of fences, 13 lines per fence, with
+highlighting off so only the block search and replacement is measured.
+"""
+from __future__ import unicode_literals
+import common
+
+BLOCK = ['Some text', '', '```python', 'x = 1', 'y = 2', 'print(x)', '```', '', 'More text', '', 'and more', '', '']
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--fences', type=int, nargs='+', default=[400, 800, 1600, 3200], help='Fence counts.')
+    args = p.parse_args()
+    common.setup(args)
+
+    import markdown
+
+    md = markdown.Markdown(
+        extensions=['pymdownx.superfences'],
+        extension_configs={'pymdownx.superfences': {'highlight_code': False}}
+    )
+    processor = md.preprocessors['fenced_code_block']
+
+    rows = []
+    for fences in args.fences:
+        lines = BLOCK * fences
+
+        def run():
+            md.reset()
+            processor.run(list(lines))
+
+        rows.append((fences, len(lines), '%.4f' % common.best(run, args.repeat)))
+    common.report(('fences', 'lines', 'time (s)'), rows)
+
+
+if __name__ == '__main__':
+    main()
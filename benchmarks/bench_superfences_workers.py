@@ -0,0 +1,75 @@
+"""
+Benchmark pooled highlighting in SuperFences.
+
+Converts a document of highlighted fences with each number of `highlight_workers` and checks that the output
+does not change with the number of workers.
+"""
+from __future__ import unicode_literals
+import common
+
+BLOCK = '''```python
+def fibonacci(count):
+    """Return the first `count` Fibonacci numbers."""
+
+    numbers = [0, 1]
+    while len(numbers) < count:
+        numbers.append(numbers[-1] + numbers[-2])
+    return numbers[:count]
+
+
+class Point(object):
+    def __init__(self, x=0, y=0):
+        self.x, self.y = x, y
+
+    def __repr__(self):
+        return 'Point(%%r, %%r)' %% (self.x, self.y)
+
+print(fibonacci(%d), Point(1, 2))
+```
+'''
+
+
+def main():
+    """Run the benchmark."""
+
+    p = common.parser(__doc__)
+    p.add_argument('--blocks', type=int, default=400, help='Number of fences in the document.')
+    p.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4], help='Worker counts to compare.')
+    p.add_argument('--executor', choices=('thread', 'process'), default='thread', help='Kind of pool.')
+    args = p.parse_args()
+    common.setup(args)
+
+    from markdown import Markdown
+    from pymdownx import highlight, superfences
+
+    text = '\n'.join(BLOCK % i for i in range(args.blocks))
+    expected = None
+    rows = []
+    for count in args.workers:
+        md = Markdown(
+            extensions=[
+                superfences.makeExtension(highlight_workers=count, highlight_executor=args.executor)
+            ]
+        )
+        # Start the pool and warm the lexer and formatter caches outside of the timing.
+        md.convert(BLOCK % -1)
+
+        def convert():
+            highlight.result_cache.clear()
+            md.reset()
+            return md.convert(text)
+
+        elapsed = common.best(convert, args.repeat)
+        html = convert()
+        highlight.result_cache.clear()
+        if expected is None:
+            expected = html
+        elif html != expected:
+            raise RuntimeError('Output with %d workers differs from the output with %d' % (count, args.workers[0]))
+        rows.append((count, '%.4f' % elapsed))
+    superfences.shutdown_executors()
+    common.report(('workers', 'time (s)'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Shared helpers for the benchmarks.
+
+Each benchmark is a standalone script, run from anywhere with the interpreter under test:
+
+    python benchmarks/bench_abbr.py [--tree PATH] [--repeat N]
+
+The bundled packages (Markdown, PyMdown Extensions and Pygments) are imported from the checkout given by
+`--tree`, which defaults to the one holding this script.  Pointing `--tree` at a second checkout, for example a
+`git worktree` of an older revision, compares two versions with the same script.  Times are the best of
+`--repeat` runs.
+"""
+from __future__ import unicode_literals
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = (
+    ('python-markdown', 'st3'),
+    ('pymdownx', 'st3'),
+    ('pygments', 'all')
+)
+
+
+def parser(description):
+    """Return an argument parser with the common options."""
+
+    p = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument('--tree', default=ROOT, help='Checkout to import the bundled packages from.')
+    p.add_argument('--repeat', type=int, default=3, help='Number of runs per case; the best time is reported.')
+    return p
+
+
+def package_paths(tree):
+    """Return the import paths of the bundled packages in `tree`."""
+
+    return [os.path.join(os.path.abspath(tree), 'Packages', *package) for package in PACKAGES]
+
+
+def setup(args):
+    """Import the bundled packages from the selected checkout."""
+
+    sys.path[:0] = package_paths(args.tree)
+
+
+def best(func, repeat):
+    """Return the best time of `repeat` calls of `func`."""
+
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def report(headers, rows, stream=sys.stdout):
+    """Write `rows` as a right aligned table."""
+
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(value) for value in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        stream.write('  '.join(value.rjust(width) for value, width in zip(row, widths)) + '\n')